@@ -3,6 +3,29 @@ import math
 import numpy as np
 from typing import List, Tuple, Optional
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy path is used without it
+    njit = None
+
+# Shared generator for vectorized weight operations
+_rng = np.random.default_rng()
+
+# Vision value per world type code (index -1 is the wall border); cell classes
+# register their values in cells.py
+VISION_LUT = np.array([0.0, 0.5, 0.7, 1.0, 0.0, -1.0], dtype=np.float32)
+
+def _tanh_fast(x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Lambert/Pade approximation of tanh, exact at the +-3 saturation points.
+    
+    Only used for action selection, so full precision is not needed.
+    """
+    out = np.clip(x, -3.0, 3.0, out=out)
+    x2 = out * out
+    np.multiply(out, 27.0 + x2, out=out)
+    np.divide(out, 27.0 + 9.0 * x2, out=out)
+    return out
+
 class NeuralNetwork:
     """Simple neural network for cell decision making"""
     
@@ -15,58 +38,130 @@ class NeuralNetwork:
         self.total_weights = (input_size * hidden_size) + hidden_size + (hidden_size * output_size) + output_size
         
         if weights is None:
-            self.weights = [random.uniform(-1, 1) for _ in range(self.total_weights)]
+            self.weights = _rng.uniform(-1.0, 1.0, self.total_weights).astype(np.float32)
         else:
-            self.weights = weights.copy()
+            self.weights = np.array(weights, dtype=np.float32)  # Always an owned copy
+        
+        self._unpack_weights()
+        
+        # Reusable activation buffers
+        self._hidden_buf = np.empty(hidden_size, dtype=np.float32)
+        self._output_buf = np.empty(output_size, dtype=np.float32)
     
     def _unpack_weights(self):
-        """Unpack flat weights into matrices and biases"""
+        """Bind weight matrices and biases as views into the flat weight buffer"""
         idx = 0
         
         # Input to hidden weights
         ih_size = self.input_size * self.hidden_size
-        ih_weights = np.array(self.weights[idx:idx + ih_size]).reshape(self.hidden_size, self.input_size)
+        self._ih = self.weights[idx:idx + ih_size].reshape(self.hidden_size, self.input_size)
         idx += ih_size
         
         # Hidden biases
-        h_bias = np.array(self.weights[idx:idx + self.hidden_size])
+        self._hb = self.weights[idx:idx + self.hidden_size]
         idx += self.hidden_size
         
         # Hidden to output weights
         ho_size = self.hidden_size * self.output_size
-        ho_weights = np.array(self.weights[idx:idx + ho_size]).reshape(self.output_size, self.hidden_size)
+        self._ho = self.weights[idx:idx + ho_size].reshape(self.output_size, self.hidden_size)
         idx += ho_size
         
         # Output biases
-        o_bias = np.array(self.weights[idx:idx + self.output_size])
+        self._ob = self.weights[idx:idx + self.output_size]
         
-        return ih_weights, h_bias, ho_weights, o_bias
+        return self._ih, self._hb, self._ho, self._ob
     
-    def forward(self, inputs: List[float]) -> List[float]:
-        """Forward pass through the network"""
-        inputs = np.array(inputs)
-        ih_weights, h_bias, ho_weights, o_bias = self._unpack_weights()
+    def forward_logits(self, inputs: List[float]) -> np.ndarray:
+        """Forward pass returning pre-activation outputs (enough for argmax) in a buffer reused by the next call"""
+        inputs = np.asarray(inputs, dtype=np.float32)
+        
+        if _forward_logits_nb is not None:
+            return _forward_logits_nb(self._ih, self._hb, self._ho, self._ob, inputs,
+                                      self._hidden_buf, self._output_buf)
         
         # Input to hidden layer
-        hidden = np.tanh(np.dot(ih_weights, inputs) + h_bias)
+        hidden = np.dot(self._ih, inputs, out=self._hidden_buf)
+        hidden += self._hb
+        _tanh_fast(hidden, out=hidden)
         
-        # Hidden to output layer
-        output = np.tanh(np.dot(ho_weights, hidden) + o_bias)
+        # Hidden to output layer (tanh is monotonic, so it is left to forward())
+        output = np.dot(self._ho, hidden, out=self._output_buf)
+        output += self._ob
+        return output
+    
+    def forward(self, inputs: List[float]) -> np.ndarray:
+        """Forward pass through the network (public API; the simulation itself uses forward_logits)
         
-        return output.tolist()
+        Returns a new array of activated outputs that later calls do not overwrite.
+        """
+        return _tanh_fast(self.forward_logits(inputs), out=self._output_buf).copy()
     
     def mutate(self, mutation_rate: float = 0.1, mutation_strength: float = 0.2):
-        """Mutate weights with given probability and strength"""
-        for i in range(len(self.weights)):
-            if random.random() < mutation_rate:
-                self.weights[i] += random.uniform(-mutation_strength, mutation_strength)
-                # Clamp weights to [-2, 2] range
-                self.weights[i] = max(-2.0, min(2.0, self.weights[i]))
+        """Mutate weights in place (the cached matrices are views and follow along)"""
+        shape = self.weights.shape
+        mask = _rng.random(shape) < mutation_rate
+        deltas = _rng.uniform(-mutation_strength, mutation_strength, shape).astype(np.float32)
+        np.add(self.weights, deltas, where=mask, out=self.weights)
+        # Clamp weights to [-2, 2] range
+        np.clip(self.weights, -2.0, 2.0, out=self.weights)
     
     def copy(self) -> 'NeuralNetwork':
         """Create a copy of this network"""
         return NeuralNetwork(self.input_size, self.hidden_size, self.output_size, self.weights)
 
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _forward_logits_nb(ih, hb, ho, ob, x, hidden, out):
+        """Single-network forward pass with explicit loops (same activation as _tanh_fast)"""
+        for h in range(ih.shape[0]):
+            acc = hb[h]
+            for i in range(ih.shape[1]):
+                acc += ih[h, i] * x[i]
+            acc = min(3.0, max(-3.0, acc))
+            acc2 = acc * acc
+            hidden[h] = acc * (27.0 + acc2) / (27.0 + 9.0 * acc2)
+        
+        for o in range(ho.shape[0]):
+            acc = ob[o]
+            for h in range(ho.shape[1]):
+                acc += ho[o, h] * hidden[h]
+            out[o] = acc
+        
+        return out
+else:
+    _forward_logits_nb = None
+
+def batch_forward_logits(networks: List[NeuralNetwork], inputs: np.ndarray) -> np.ndarray:
+    """Evaluate many networks of the same topology in one pass.
+    
+    inputs has shape (N, input_size); returns pre-activation outputs of shape (N, output_size).
+    """
+    first = networks[0]
+    n = len(networks)
+    i_size, h_size, o_size = first.input_size, first.hidden_size, first.output_size
+    
+    weights = np.stack([network.weights for network in networks])
+    
+    idx = 0
+    ih_size = i_size * h_size
+    ih = weights[:, idx:idx + ih_size].reshape(n, h_size, i_size)
+    idx += ih_size
+    hb = weights[:, idx:idx + h_size]
+    idx += h_size
+    ho_size = h_size * o_size
+    ho = weights[:, idx:idx + ho_size].reshape(n, o_size, h_size)
+    idx += ho_size
+    ob = weights[:, idx:idx + o_size]
+    
+    hidden = np.einsum('nhi,ni->nh', ih, inputs) + hb
+    _tanh_fast(hidden, out=hidden)
+    
+    return np.einsum('noh,nh->no', ho, hidden) + ob
+
+# Compile the JIT kernel up front rather than on the first creature's move
+if _forward_logits_nb is not None:
+    NeuralNetwork().forward_logits(np.zeros(10, dtype=np.float32))
+
 class CellBrain:
     """Brain for cellular decision making with evolutionary capabilities"""
     
@@ -76,66 +171,84 @@ class CellBrain:
     # Action mapping: 0-7 = move in direction, 8 = stay still
     ACTIONS = DIRECTIONS + [(0, 0)]
     
+    # DIRECTIONS as flat offset arrays for vectorized grid indexing
+    DIR_DX = np.array([dx for dx, _ in DIRECTIONS], dtype=np.intp)
+    DIR_DY = np.array([dy for _, dy in DIRECTIONS], dtype=np.intp)
+    
     def __init__(self, neural_network: NeuralNetwork = None):
         self.network = neural_network if neural_network else NeuralNetwork()
         self.fitness = 0.0  # Fitness score for evolution
         self.age_at_death = 0
         self.energy_gained = 0
         self.offspring_count = 0
+        self._planned_action = None  # Set by plan_actions() for the current tick
+        self._sensor_buf = np.empty(self.network.input_size, dtype=np.float32)
     
-    def see_environment(self, cell, world) -> List[float]:
-        """Generate sensory input from environment (10 values)"""
-        vision = self._get_vision(cell, world)  # 8 values
-        internal = self._get_internal_state(cell)  # 2 values
-        return vision + internal
+    @classmethod
+    def plan_actions(cls, cells, world):
+        """Decide the next action for many cells with batched network evaluation"""
+        cls.plan_actions_batched([(cells, world)])
     
-    def _get_vision(self, cell, world) -> List[float]:
-        """Get vision in 8 directions around cell"""
-        vision = []
+    @classmethod
+    def plan_actions_batched(cls, batches):
+        """plan_actions for (cells, world) pairs from several worlds, with one network pass per topology"""
+        groups = {}
+        for cells, world in batches:
+            for cell in cells:
+                cell.brain.see_environment(cell, world)
+                network = cell.brain.network
+                topology = (network.input_size, network.hidden_size, network.output_size)
+                groups.setdefault(topology, []).append(cell)
         
-        for dx, dy in self.DIRECTIONS:
-            check_x, check_y = cell.x + dx, cell.y + dy
+        for group in groups.values():
+            inputs = np.array([cell.brain._sensor_buf for cell in group], dtype=np.float32)
+            logits = batch_forward_logits([cell.brain.network for cell in group], inputs)
             
-            # Check bounds
-            if not (0 <= check_x < world.width and 0 <= check_y < world.height):
-                vision.append(-1.0)  # Wall/boundary
-                continue
-            
-            target_cell = world.grid[check_y][check_x]
-            
-            if target_cell is None:
-                vision.append(0.0)  # Empty space
-            elif target_cell.__class__.__name__ == 'Planta':
-                vision.append(0.5)  # Plant
-            elif target_cell.__class__.__name__ == 'Herbivoro':
-                vision.append(0.7)  # Herbivore
-            elif target_cell.__class__.__name__ == 'Carnivoro':
-                vision.append(1.0)  # Carnivore
-            else:
-                vision.append(0.0)  # Unknown
+            for cell, best_action in zip(group, np.argmax(logits, axis=1).tolist()):
+                cell.brain._planned_action = cls.ACTIONS[best_action]
+    
+    def see_environment(self, cell, world) -> np.ndarray:
+        """Generate sensory input from environment (10 values) into the brain's sensor buffer"""
+        self._get_vision(cell, world)  # 8 values
+        self._get_internal_state(cell)  # 2 values
+        return self._sensor_buf
+    
+    def _get_vision(self, cell, world) -> np.ndarray:
+        """Get vision in 8 directions around cell"""
+        # Type codes of the 8 neighbours (type_grid has a 1-cell border, hence the +1)
+        codes = world.type_grid[self.DIR_DY + (cell.y + 1), self.DIR_DX + (cell.x + 1)]
         
+        # Empty 0.0, plant 0.5, herbivore 0.7, carnivore 1.0, wall -1.0
+        vision = self._sensor_buf[:8]
+        vision[:] = VISION_LUT[codes]
         return vision
     
-    def _get_internal_state(self, cell) -> List[float]:
+    def _get_internal_state(self, cell) -> np.ndarray:
         """Get internal cell state (energy, age)"""
         # Normalize energy (assume max energy around 100)
-        energy_normalized = min(1.0, getattr(cell, 'energy', 50) / 100.0) if hasattr(cell, 'energy') else 0.5
+        self._sensor_buf[8] = min(1.0, cell.energy * 0.01)
         
         # Normalize age (assume max age around 100)
-        age_normalized = min(1.0, cell.age / 100.0)
+        self._sensor_buf[9] = min(1.0, cell.age * 0.01)
         
-        return [energy_normalized, age_normalized]
+        return self._sensor_buf[8:]
     
     def decide_action(self, cell, world) -> Tuple[int, int]:
         """Use neural network to decide next action"""
+        # Use the batched decision for this tick if there is one
+        if self._planned_action is not None:
+            action = self._planned_action
+            self._planned_action = None
+            return action
+        
         # Get sensory input
         inputs = self.see_environment(cell, world)
         
-        # Get network output
-        outputs = self.network.forward(inputs)
+        # Get network output before the final activation
+        logits = self.network.forward_logits(inputs)
         
         # Find action with highest activation
-        best_action = outputs.index(max(outputs))
+        best_action = int(np.argmax(logits))
         
         return self.ACTIONS[best_action]
     
@@ -156,24 +269,19 @@ class CellBrain:
     
     def _crossover(self, partner_network: NeuralNetwork) -> NeuralNetwork:
         """Create child network through crossover of two parent networks"""
-        child_weights = []
+        parent_weights = self.network.weights
         
-        for i in range(len(self.network.weights)):
-            # Random crossover - take gene from either parent
-            if random.random() < 0.5:
-                child_weights.append(self.network.weights[i])
-            else:
-                child_weights.append(partner_network.weights[i])
+        # Random crossover - take each gene from either parent
+        mask = _rng.random(parent_weights.shape) < 0.5
+        child_weights = np.where(mask, parent_weights, partner_network.weights)
         
         return NeuralNetwork(weights=child_weights)
     
     def update_fitness(self, cell):
         """Update fitness based on cell performance"""
         base_fitness = cell.age  # Survival time
-        
-        if hasattr(cell, 'energy'):
-            base_fitness += cell.energy * 0.1  # Current energy
-            base_fitness += self.energy_gained * 0.05  # Total energy gained
+        base_fitness += cell.energy * 0.1  # Current energy
+        base_fitness += self.energy_gained * 0.05  # Total energy gained
         
         base_fitness += self.offspring_count * 10  # Reproduction bonus
         
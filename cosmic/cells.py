@@ -1,6 +1,10 @@
 import random
+import itertools
+import numpy as np
+from array import array
+from collections import deque
 from typing import Optional, Tuple, List
-from .brain import CellBrain
+from .brain import CellBrain, VISION_LUT
 from .objects import UniverseObject
 from .discovery_system import DISCOVERY_DETECTOR
 from .interactions import INTERACTION_ENGINE
@@ -13,24 +17,139 @@ class Colors:
     RESET = '\033[0m'     # Reset color
     BOLD = '\033[1m'      # Bold text
 
+def type_code_mask(*type_codes: int) -> np.ndarray:
+    """Boolean lookup over world type codes for World.scan_3x3 (the -1 wall entry is never set)"""
+    mask = np.zeros(6, dtype=bool)  # Codes 0-4, then index 5 == -1 for the wall border
+    mask[list(type_codes)] = True
+    return mask
+
+class CellStateArena:
+    """Structure-of-arrays storage for per-cell numeric state, indexed by a slot per cell.
+    
+    Each field lives in an array.array (cheap scalar access from Python) and is exposed
+    as a NumPy view over the same memory for vectorized updates.
+    """
+    
+    FIELDS = {
+        'age': ('i', np.int32),
+        'energy': ('i', np.int32),
+        'cooldown': ('h', np.int16),
+        'curiosity': ('f', np.float32),
+        'metabolism': ('i', np.int32),  # Energy burned per tick
+    }
+    
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.scalars = {name: array(typecode, bytes(array(typecode).itemsize * capacity))
+                        for name, (typecode, _) in self.FIELDS.items()}
+        self._bind_views()
+        self._free_slots = list(range(capacity - 1, -1, -1))
+    
+    def _bind_views(self):
+        """Expose each field as a NumPy array sharing memory with its array.array"""
+        for name, (_, dtype) in self.FIELDS.items():
+            setattr(self, name, np.frombuffer(self.scalars[name], dtype=dtype))
+    
+    def allocate(self) -> int:
+        """Reserve a zeroed slot, growing the arrays if needed"""
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        for values in self.scalars.values():
+            values[slot] = 0
+        return slot
+    
+    def release(self, slot: int):
+        """Return a slot for reuse"""
+        self._free_slots.append(slot)
+    
+    def _grow(self):
+        """Double the capacity of every array"""
+        old_capacity = self.capacity
+        self.capacity *= 2
+        
+        # The NumPy views pin the buffers, so drop them before resizing
+        for name in self.FIELDS:
+            setattr(self, name, None)
+        for values in self.scalars.values():
+            values.extend(array(values.typecode, bytes(values.itemsize * old_capacity)))
+        self._bind_views()
+        
+        self._free_slots.extend(range(self.capacity - 1, old_capacity - 1, -1))
+    
+    def advance(self, slots):
+        """Age the given cells by one tick and burn their metabolism"""
+        self.age[slots] += 1
+        self.energy[slots] -= self.metabolism[slots]
+
+# Global per-cell state storage
+CELL_STATE = CellStateArena()
+
+# Source of stable integer cell ids (0 is left unused)
+_cell_id_counter = itertools.count(1)
+
+def _state_field(name: str, doc: str) -> property:
+    """Cell attribute backed by the CELL_STATE field of the given name"""
+    values = CELL_STATE.scalars[name]  # Resized in place, so safe to capture
+    
+    def fget(self):
+        return values[self._slot]
+    
+    def fset(self, value):
+        values[self._slot] = value
+    
+    return property(fget, fset, doc=doc)
+
 class Celula:
+    TYPE_CODE = 4        # Grid type code (0 is reserved for empty space)
+    VISION_VALUE = 0.0   # How this cell looks to a neighbour's brain
+    INVENTORY_SIZE = 32  # Oldest items are dropped beyond this
+    EMPTY_MASK = type_code_mask(0)
+    MOVE_MASK = EMPTY_MASK  # Positions this cell can move into
+    METABOLISM = 0       # Energy burned per tick
+    
+    age = _state_field('age', "Ticks this cell has lived")
+    energy = _state_field('energy', "Current energy; 0 for cells that do not use it")
+    experimentation_cooldown = _state_field('cooldown', "Prevents constant experimentation")
+    curiosity = _state_field('curiosity', "How likely to experiment")
+    
     def __init__(self, x: int, y: int, brain: CellBrain = None):
+        self._slot = CELL_STATE.allocate()
+        CELL_STATE.metabolism[self._slot] = self.METABOLISM
+        self.cid = next(_cell_id_counter)
+        
         self.x = x
         self.y = y
         self.age = 0
         self.brain = brain if brain else CellBrain()
-        self._last_energy = getattr(self, 'energy', 0)
+        self.energy = 0
         
         # Discovery and tool system
-        self.inventory = []  # Tools and objects this cell has discovered/created
-        self.known_discoveries = set()  # IDs of discoveries this cell knows about
+        self.inventory = deque(maxlen=self.INVENTORY_SIZE)  # Tools and objects this cell has discovered/created
+        self.known_discoveries = 0  # Bitset of Discovery.serial numbers this cell knows about
         self.experimentation_cooldown = 0  # Prevents constant experimentation
         self.curiosity = random.uniform(0.1, 0.9)  # How likely to experiment
     
+    def release_state(self):
+        """Return this cell's CELL_STATE slot for reuse; the cell's state must not be used afterwards"""
+        if self._slot is not None:
+            CELL_STATE.release(self._slot)
+            self._slot = None
+    
+    def __del__(self):
+        # Backstop for cells dropped without release_state(); CELL_STATE may
+        # already be gone during interpreter shutdown
+        if CELL_STATE is not None:
+            self.release_state()
+    
     def update(self, world) -> Optional['Celula']:
         """Update cell state and return new cell if reproduction occurs"""
-        self.age += 1
-        
+        # Aging and metabolism; World.update applies this to all cells at once
+        CELL_STATE.advance(self._slot)
+        return self.act(world)
+    
+    def act(self, world) -> Optional['Celula']:
+        """Per-tick behaviour once aging/metabolism has been applied"""
         # Reduce experimentation cooldown
         if self.experimentation_cooldown > 0:
             self.experimentation_cooldown -= 1
@@ -43,7 +162,7 @@ class Celula:
     def attempt_discovery(self, world):
         """Attempt to discover new objects through experimentation"""
         if (self.experimentation_cooldown <= 0 and 
-            random.random() < self.curiosity and 
+            world.rand() < self.curiosity and 
             len(self.inventory) >= 2):
             
             # Pick two random objects from inventory to combine
@@ -58,11 +177,11 @@ class Celula:
                     # Check for discovery
                     discovery = DISCOVERY_DETECTOR.analyze_interaction_result(
                         result, tick=world.step_count, 
-                        discoverer_id=f"Cell_{id(self)}"
+                        discoverer_id=self.cid
                     )
                     
-                    if discovery and discovery.id not in self.known_discoveries:
-                        self.known_discoveries.add(discovery.id)
+                    if discovery and not self.known_discoveries >> discovery.serial & 1:
+                        self.known_discoveries |= 1 << discovery.serial
                         
                         # Add new objects to inventory
                         if result.new_objects:
@@ -79,52 +198,44 @@ class Celula:
     
     def share_discovery_with_neighbors(self, world, discovery):
         """Share discovery knowledge with adjacent cells"""
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                neighbor_x, neighbor_y = self.x + dx, self.y + dy
+        discovery_bit = 1 << discovery.serial
+        
+        for neighbor in world.get_neighbor_cells(self.x, self.y):
+            if not neighbor.known_discoveries & discovery_bit:
+                neighbor.known_discoveries |= discovery_bit
                 
-                if (0 <= neighbor_x < world.width and 
-                    0 <= neighbor_y < world.height):
-                    
-                    neighbor = world.grid[neighbor_y][neighbor_x]
-                    if (isinstance(neighbor, Celula) and 
-                        discovery.id not in neighbor.known_discoveries):
-                        neighbor.known_discoveries.add(discovery.id)
-                        
-                        # Neighbors get some objects too (knowledge sharing)
-                        if hasattr(discovery, 'result') and discovery.result.new_objects:
-                            for obj in discovery.result.new_objects[:1]:  # Share 1 object
-                                neighbor.inventory.append(obj.copy() if hasattr(obj, 'copy') else obj)
+                # Neighbors get some objects too (knowledge sharing)
+                if hasattr(discovery, 'result') and discovery.result.new_objects:
+                    for obj in discovery.result.new_objects[:1]:  # Share 1 object
+                        neighbor.inventory.append(obj.copy() if hasattr(obj, 'copy') else obj)
+    
+    def _get_adjacent_empty_positions(self, world) -> List[Tuple[int, int]]:
+        """Get list of adjacent empty positions"""
+        return world.scan_3x3(self.x, self.y, self.EMPTY_MASK)
+    
+    def _get_adjacent_positions(self, world) -> List[Tuple[int, int]]:
+        """Get list of valid adjacent positions (empty or with prey)"""
+        return world.scan_3x3(self.x, self.y, self.MOVE_MASK)
     
     def find_basic_materials(self, world):
         """Look for basic materials in the environment to start experimenting"""
         if len(self.inventory) < 3:
-            # Check for scattered materials at current position
-            if (hasattr(world, 'scattered_materials') and 
-                (self.x, self.y) in world.scattered_materials):
-                material = world.scattered_materials[(self.x, self.y)]
+            scattered = world.scattered_materials
+            
+            # Check for scattered materials at current position (and remove it from world)
+            material = scattered.pop((self.x, self.y), None)
+            if material is not None:
                 self.inventory.append(material)
-                del world.scattered_materials[(self.x, self.y)]  # Remove from world
                 return
             
             # Check adjacent positions for materials
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    check_x, check_y = self.x + dx, self.y + dy
-                    if (0 <= check_x < world.width and 0 <= check_y < world.height):
-                        if (hasattr(world, 'scattered_materials') and 
-                            (check_x, check_y) in world.scattered_materials and
-                            random.random() < 0.3):  # 30% chance to find nearby material
-                            material = world.scattered_materials[(check_x, check_y)]
-                            self.inventory.append(material)
-                            del world.scattered_materials[(check_x, check_y)]
-                            return
+            for position in world.get_material_positions(self.x, self.y):
+                if position in scattered and world.rand() < 0.3:  # 30% chance to find nearby material
+                    self.inventory.append(scattered.pop(position))
+                    return
             
             # Fallback: generate basic materials if none found
-            if len(self.inventory) < 2 and random.random() < 0.05:
+            if len(self.inventory) < 2 and world.rand() < 0.05:
                 basic_materials = [
                     UniverseObject("Piedra", ["es_duro"]),
                     UniverseObject("Palo", ["es_organico", "es_fragil"]),
@@ -147,14 +258,15 @@ class Celula:
         return self.get_symbol()
 
 class Planta(Celula):
+    TYPE_CODE = 1
+    VISION_VALUE = 0.5
+    
     def __init__(self, x: int, y: int, reproduction_age: int = 10, max_age: int = 50):
         super().__init__(x, y)
         self.reproduction_age = reproduction_age
         self.max_age = max_age
     
-    def update(self, world) -> Optional['Planta']:
-        self.age += 1
-        
+    def act(self, world) -> Optional['Planta']:
         if self.age >= self.reproduction_age and self.age % self.reproduction_age == 0:
             return self._reproduce(world)
         
@@ -170,23 +282,6 @@ class Planta(Celula):
         
         return None
     
-    def _get_adjacent_empty_positions(self, world) -> List[Tuple[int, int]]:
-        """Get list of adjacent empty positions"""
-        positions = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                new_x, new_y = self.x + dx, self.y + dy
-                
-                if (0 <= new_x < world.width and 
-                    0 <= new_y < world.height and 
-                    world.grid[new_y][new_x] is None):
-                    positions.append((new_x, new_y))
-        
-        return positions
-    
     def should_die(self) -> bool:
         return self.age >= self.max_age
     
@@ -197,24 +292,19 @@ class Planta(Celula):
         return f"{Colors.GREEN}{self.get_symbol()}{Colors.RESET}"
 
 class Herbivoro(Celula):
+    TYPE_CODE = 2
+    VISION_VALUE = 0.7
+    MOVE_MASK = type_code_mask(0, Planta.TYPE_CODE)
+    METABOLISM = 1
+    
     def __init__(self, x: int, y: int, brain: CellBrain = None, initial_energy: int = 20, 
                  energy_per_plant: int = 15, reproduction_threshold: int = 30):
         super().__init__(x, y, brain)
         self.energy = initial_energy
         self.energy_per_plant = energy_per_plant
         self.reproduction_threshold = reproduction_threshold
-        self._last_energy = initial_energy
     
-    def update(self, world) -> Optional['Herbivoro']:
-        self.age += 1
-        self.energy -= 1
-        
-        # Update brain fitness with energy changes
-        energy_gained = self.energy - self._last_energy
-        if energy_gained > 0:
-            self.brain.record_energy_gain(energy_gained)
-        self._last_energy = self.energy
-        
+    def act(self, world) -> Optional['Herbivoro']:
         if self.energy <= 0:
             self.brain.record_death(self.age)
             return None
@@ -249,54 +339,23 @@ class Herbivoro(Celula):
         
         # If target is a plant, eat it
         if isinstance(target_cell, Planta):
-            world.grid[new_y][new_x] = None
-            old_energy = self.energy
+            world.set_cell(new_x, new_y, None)
             self.energy += self.energy_per_plant
-            self.brain.record_energy_gain(self.energy - old_energy)
+            self.brain.energy_gained += self.energy_per_plant  # Inlined record_energy_gain
         
         # If target is empty, move there
         if target_cell is None or isinstance(target_cell, Planta):
-            world.grid[self.y][self.x] = None
+            world.set_cell(self.x, self.y, None)
             self.x, self.y = new_x, new_y
-            world.grid[self.y][self.x] = self
+            world.set_cell(self.x, self.y, self)
     
     def _move_and_eat(self, world):
         """Legacy method - kept for compatibility"""
         self._brain_move_and_eat(world)
     
-    def _get_adjacent_positions(self, world) -> List[Tuple[int, int]]:
-        """Get list of valid adjacent positions (empty or with plants)"""
-        positions = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                new_x, new_y = self.x + dx, self.y + dy
-                
-                if (0 <= new_x < world.width and 
-                    0 <= new_y < world.height):
-                    
-                    target_cell = world.grid[new_y][new_x]
-                    if target_cell is None or isinstance(target_cell, Planta):
-                        positions.append((new_x, new_y))
-        
-        return positions
-    
     def _brain_reproduce(self, world) -> Optional['Herbivoro']:
         """Reproduce using brain evolution"""
-        adjacent_empty_positions = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                new_x, new_y = self.x + dx, self.y + dy
-                
-                if (0 <= new_x < world.width and 
-                    0 <= new_y < world.height and 
-                    world.grid[new_y][new_x] is None):
-                    adjacent_empty_positions.append((new_x, new_y))
+        adjacent_empty_positions = self._get_adjacent_empty_positions(world)
         
         if adjacent_empty_positions:
             self.energy //= 2
@@ -325,24 +384,19 @@ class Herbivoro(Celula):
         return f"{Colors.YELLOW}{self.get_symbol()}{Colors.RESET}"
 
 class Carnivoro(Celula):
+    TYPE_CODE = 3
+    VISION_VALUE = 1.0
+    MOVE_MASK = type_code_mask(0, Herbivoro.TYPE_CODE)
+    METABOLISM = 2  # Carnivores consume more energy
+    
     def __init__(self, x: int, y: int, brain: CellBrain = None, initial_energy: int = 30, 
                  energy_per_herbivore: int = 25, reproduction_threshold: int = 50):
         super().__init__(x, y, brain)
         self.energy = initial_energy
         self.energy_per_herbivore = energy_per_herbivore
         self.reproduction_threshold = reproduction_threshold
-        self._last_energy = initial_energy
     
-    def update(self, world) -> Optional['Carnivoro']:
-        self.age += 1
-        self.energy -= 2  # Carnivores consume more energy
-        
-        # Update brain fitness with energy changes
-        energy_gained = self.energy - self._last_energy
-        if energy_gained > 0:
-            self.brain.record_energy_gain(energy_gained)
-        self._last_energy = self.energy
-        
+    def act(self, world) -> Optional['Carnivoro']:
         if self.energy <= 0:
             self.brain.record_death(self.age)
             return None
@@ -377,54 +431,23 @@ class Carnivoro(Celula):
         
         # If target is a herbivore, hunt it
         if isinstance(target_cell, Herbivoro):
-            world.grid[new_y][new_x] = None
-            old_energy = self.energy
+            world.set_cell(new_x, new_y, None)
             self.energy += self.energy_per_herbivore
-            self.brain.record_energy_gain(self.energy - old_energy)
+            self.brain.energy_gained += self.energy_per_herbivore  # Inlined record_energy_gain
         
         # If target is empty, move there
         if target_cell is None or isinstance(target_cell, Herbivoro):
-            world.grid[self.y][self.x] = None
+            world.set_cell(self.x, self.y, None)
             self.x, self.y = new_x, new_y
-            world.grid[self.y][self.x] = self
+            world.set_cell(self.x, self.y, self)
     
     def _hunt_and_eat(self, world):
         """Legacy method - kept for compatibility"""
         self._brain_hunt_and_eat(world)
     
-    def _get_adjacent_positions(self, world) -> List[Tuple[int, int]]:
-        """Get list of valid adjacent positions (empty or with herbivores)"""
-        positions = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                new_x, new_y = self.x + dx, self.y + dy
-                
-                if (0 <= new_x < world.width and 
-                    0 <= new_y < world.height):
-                    
-                    target_cell = world.grid[new_y][new_x]
-                    if target_cell is None or isinstance(target_cell, Herbivoro):
-                        positions.append((new_x, new_y))
-        
-        return positions
-    
     def _brain_reproduce(self, world) -> Optional['Carnivoro']:
         """Reproduce using brain evolution"""
-        adjacent_empty_positions = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                new_x, new_y = self.x + dx, self.y + dy
-                
-                if (0 <= new_x < world.width and 
-                    0 <= new_y < world.height and 
-                    world.grid[new_y][new_x] is None):
-                    adjacent_empty_positions.append((new_x, new_y))
+        adjacent_empty_positions = self._get_adjacent_empty_positions(world)
         
         if adjacent_empty_positions:
             self.energy //= 2
@@ -450,4 +473,8 @@ class Carnivoro(Celula):
         return "X"
     
     def get_colored_symbol(self) -> str:
-        return f"{Colors.RED}{Colors.BOLD}{self.get_symbol()}{Colors.RESET}"
\ No newline at end of file
+        return f"{Colors.RED}{Colors.BOLD}{self.get_symbol()}{Colors.RESET}"
+
+# Register how each cell type looks to CellBrain._get_vision
+for _cell_type in (Celula, Planta, Herbivoro, Carnivoro):
+    VISION_LUT[_cell_type.TYPE_CODE] = _cell_type.VISION_VALUE
\ No newline at end of file
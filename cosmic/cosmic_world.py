@@ -4,16 +4,26 @@ Cosmic World System - Multi-planetary universe with different environments
 Each planet has unique properties, materials, and environmental conditions
 """
 
-import random
+import math
+import logging
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
-from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, field
+from enum import StrEnum, unique
 from .world import World
+from .brain import CellBrain
 from .objects import UniverseObject
 from .properties import PROPERTY_REGISTRY, PropertyType
 
-class PlanetType(Enum):
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy path is used without it
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+@unique
+class PlanetType(StrEnum):
     """Different types of planets with unique characteristics"""
     TERRAN = "terran"           # Earth-like, balanced ecosystem
     VOLCANIC = "volcanic"       # High heat, mineral rich
@@ -26,7 +36,7 @@ class PlanetType(Enum):
     MAGNETIC = "magnetic"       # Strong magnetic fields, conductive materials
     QUANTUM = "quantum"         # Exotic physics, strange materials
 
-@dataclass
+@dataclass(slots=True)
 class CosmicEvent:
     """Events that affect multiple planets"""
     name: str
@@ -36,32 +46,191 @@ class CosmicEvent:
     effects: Dict[str, Any]
     probability: float = 0.01
 
-@dataclass
+@dataclass(slots=True)
 class Planet:
     """A planet in the cosmic system"""
     id: str
     name: str
     planet_type: PlanetType
     world: World
-    position: Tuple[float, float, float]  # 3D coordinates in space
     native_materials: List[UniverseObject]
     environmental_conditions: Dict[str, float]
     discovery_bonus_multiplier: float = 1.0
-    trade_routes: List[str] = None  # IDs of connected planets
+    trade_routes: Set[str] = field(default_factory=set)  # IDs of connected planets
+    _sim: Optional['CosmicSimulation'] = field(default=None, repr=False, compare=False)
+    _pos_index: int = -1  # Row in the simulation's positions array
     
-    def __post_init__(self):
-        if self.trade_routes is None:
-            self.trade_routes = []
+    @property
+    def position(self) -> np.ndarray:
+        """3D coordinates in space, as a view into the simulation's positions array"""
+        return self._sim._positions[self._pos_index]
+
+_BASE_CONDITIONS = {"temperature": 20.0, "pressure": 1.0, "radiation": 0.0, "magnetic_field": 0.1}
+
+# Per planet type: native materials as (name, property names), overrides of
+# _BASE_CONDITIONS and discovery multiplier
+_PLANET_PROFILES = {
+    PlanetType.TERRAN: (
+        (
+            ("Piedra Terrestre", ("es_duro", "es_pesado")),
+            ("Madera Nativa", ("es_organico", "es_fragil", "es_inflamable")),
+            ("Agua Pura", ("es_solvente", "es_humedo")),
+            ("Mineral de Hierro", ("es_duro", "es_magnetico")),
+            ("Planta Medicinal", ("es_organico", "es_curativo")),
+        ),
+        {"temperature": 25.0, "pressure": 1.0, "radiation": 0.1},
+        1.0,
+    ),
+    PlanetType.VOLCANIC: (
+        (
+            ("Obsidiana", ("es_cortante", "es_fragil", "es_cristalino")),
+            ("Azufre Volcánico", ("es_acido", "es_reactivo", "es_explosivo")),
+            ("Lava Solidificada", ("es_duro", "retiene_calor", "es_caliente")),
+            ("Gas Volcánico", ("es_toxico", "es_caliente", "es_reactivo")),
+            ("Cristal de Magma", ("es_cristalino", "es_caliente", "brilla")),
+        ),
+        {"temperature": 80.0, "pressure": 1.5, "radiation": 0.3},
+        1.3,  # Heat accelerates reactions
+    ),
+    PlanetType.ICE: (
+        (
+            ("Hielo Eterno", ("es_duro", "es_frio", "es_cristalino")),
+            ("Cristal de Nitrógeno", ("es_frio", "es_cristalino", "es_fragil")),
+            ("Permafrost Orgánico", ("es_organico", "es_frio", "es_preservativo")),
+            ("Hielo Metálico", ("es_duro", "es_frio", "conduce_electricidad")),
+            ("Vapor Helado", ("es_frio", "es_viscoso", "absorbe_calor")),
+        ),
+        {"temperature": -40.0, "pressure": 0.3, "radiation": 0.05},
+        0.7,  # Cold slows reactions
+    ),
+    PlanetType.GAS_GIANT: (
+        (
+            ("Gas Noble", ("es_estable", "brilla", "es_liviano")),
+            ("Cristal Flotante", ("es_cristalino", "es_liviano", "vibra")),
+            ("Plasma Frío", ("brilla", "conduce_electricidad", "genera_campo")),
+            ("Núcleo Energético", ("genera_campo", "es_radioactivo", "vibra")),
+            ("Éter Condensado", ("es_liviano", "absorbe_luz", "es_viscoso")),
+        ),
+        {"temperature": 15.0, "pressure": 0.1, "radiation": 0.8, "magnetic_field": 2.0},
+        1.5,  # High energy environment
+    ),
+    PlanetType.DESERT: (
+        (
+            ("Arena Silícea", ("es_abrasivo", "es_cristalino", "absorbe_calor")),
+            ("Sal Mineral", ("es_cristalino", "es_solvente", "es_estable")),
+            ("Cactus Resistente", ("es_organico", "es_nutritivo", "retiene_agua")),
+            ("Piedra Porosa", ("es_liviano", "absorbe_agua", "es_fragil")),
+            ("Viento Seco", ("es_abrasivo", "es_caliente", "es_liviano")),
+        ),
+        {"temperature": 50.0, "pressure": 0.8, "radiation": 0.6},
+        1.0,
+    ),
+    PlanetType.OCEAN: (
+        (
+            ("Agua Salada", ("es_solvente", "conduce_electricidad", "es_humedo")),
+            ("Alga Bioluminiscente", ("es_organico", "brilla", "es_nutritivo")),
+            ("Concha Nácarada", ("es_duro", "es_cristalino", "es_organico")),
+            ("Coral Viviente", ("es_vivo", "es_cristalino", "es_organico")),
+            ("Perla Energética", ("brilla", "genera_campo", "es_cristalino")),
+        ),
+        {"temperature": 18.0, "pressure": 2.0, "radiation": 0.2},
+        1.2,  # Water accelerates organic reactions
+    ),
+    PlanetType.CRYSTAL: (
+        (
+            ("Cuarzo Resonante", ("es_cristalino", "vibra", "es_piezoelectrico")),
+            ("Diamante Conductor", ("es_duro", "conduce_electricidad", "es_cristalino")),
+            ("Cristal Amplificador", ("es_cristalino", "brilla", "genera_campo")),
+            ("Geoda Energética", ("es_cristalino", "genera_campo", "absorbe_luz")),
+            ("Prisma Cuántico", ("es_cristalino", "absorbe_luz", "genera_campo")),
+        ),
+        {"temperature": 10.0, "pressure": 1.2, "radiation": 0.4, "magnetic_field": 0.5},
+        1.8,  # Crystals amplify energy interactions
+    ),
+    PlanetType.TOXIC: (
+        (
+            ("Ácido Alienígena", ("es_acido", "es_toxico", "es_reactivo")),
+            ("Esporas Tóxicas", ("es_toxico", "es_organico", "es_venenoso")),
+            ("Metal Corrosivo", ("es_duro", "es_toxico", "es_reactivo")),
+            ("Gas Mutagénico", ("es_toxico", "es_reactivo", "es_psicoactivo")),
+            ("Cristal Venenoso", ("es_cristalino", "es_toxico", "brilla")),
+        ),
+        {"temperature": 35.0, "pressure": 1.3, "radiation": 1.2},
+        2.0,  # Extreme conditions create exotic reactions
+    ),
+    PlanetType.MAGNETIC: (
+        (
+            ("Hierro Magnético", ("es_magnetico", "es_duro", "conduce_electricidad")),
+            ("Superconductor Natural", ("es_superconductor", "conduce_electricidad", "es_frio")),
+            ("Campo Cristalizado", ("genera_campo", "es_cristalino", "es_magnetico")),
+            ("Bobina Orgánica", ("conduce_electricidad", "es_organico", "es_flexible")),
+            ("Plasma Magnético", ("brilla", "es_magnetico", "genera_campo")),
+        ),
+        {"magnetic_field": 5.0, "radiation": 0.8},
+        1.6,  # Magnetic fields enhance electrical discoveries
+    ),
+    PlanetType.QUANTUM: (
+        (
+            ("Materia Oscura Simulada", ("absorbe_luz", "genera_campo", "es_frio")),
+            ("Partícula Entrelazada", ("genera_campo", "vibra", "es_liviano")),
+            ("Vacío Cristalizado", ("es_cristalino", "absorbe_luz", "genera_campo")),
+            ("Energía Pura", ("brilla", "genera_campo", "es_liviano")),
+            ("Anomalía Temporal", ("vibra", "genera_campo", "absorbe_luz")),
+        ),
+        {"radiation": 2.0, "magnetic_field": 3.0, "pressure": 0.05},
+        3.0,  # Quantum effects create breakthrough discoveries
+    ),
+}
+
+# Cosmic event templates: (name, description, duration_ticks, effects, planets affected; None = all)
+_EVENT_TEMPLATES = (
+    ("Tormenta Solar", "Radiación intensa afecta materiales electromagnéticos",
+     50, {"radiation_boost": 2.0, "magnetic_interference": 1.5}, 3),
+    ("Alineación Cuántica", "Efectos cuánticos intensificados en múltiples mundos",
+     20, {"discovery_multiplier": 2.5, "exotic_materials": True}, None),
+    ("Lluvia de Meteoritos", "Nuevos materiales extraterrestres llegan",
+     30, {"new_materials": True, "impact_damage": 0.1}, 2),
+)
+
+if njit is not None:
+    # Eager signature: compiled (or loaded from the on-disk cache) at import, not mid-step
+    @njit("boolean[:, ::1](float64[:, ::1], float64)", parallel=True, fastmath=True, cache=True, nogil=True)
+    def _trade_eligibility_nb(pos, threshold):
+        """Upper-triangle mask of planet pairs closer than threshold, compared squared"""
+        n = pos.shape[0]
+        limit = threshold * threshold
+        mask = np.zeros((n, n), dtype=np.bool_)
+        for i in prange(n):
+            for j in range(i + 1, n):
+                dx = pos[i, 0] - pos[j, 0]
+                dy = pos[i, 1] - pos[j, 1]
+                dz = pos[i, 2] - pos[j, 2]
+                mask[i, j] = dx * dx + dy * dy + dz * dz < limit
+        return mask
+else:
+    _trade_eligibility_nb = None
 
 class CosmicSimulation:
     """Manages multiple planets and cosmic events"""
     
+    TRADE_DISTANCE = 500.0  # Planets closer than this can open trade routes
+    
     def __init__(self):
         self.planets: Dict[str, Planet] = {}
         self.step_count = 0
         self.active_cosmic_events = []
         self.trade_manifest = {}  # Track objects moving between planets
         self.discovery_network = {}  # Shared discoveries across planets
+        self._rng = np.random.default_rng()
+        
+        # Planet positions as one (N, 3) array; row i belongs to _planet_ids[i].
+        # It is a prefix view of a buffer that grows by doubling.
+        self._position_buf = np.empty((8, 3), dtype=np.float64)
+        self._positions = self._position_buf[:0]
+        self._planet_ids: List[str] = []
+        self._planet_index: Dict[str, int] = {}
+        self._distances: Optional[np.ndarray] = None  # Pairwise distances, rebuilt when planets change
+        self._trade_candidates: Optional[np.ndarray] = None  # (K, 2) row pairs within TRADE_DISTANCE, same lifetime
         
     def create_planet(self, planet_id: str, name: str, planet_type: PlanetType, 
                      size: Tuple[int, int] = (50, 50), position: Tuple[float, float, float] = None) -> Planet:
@@ -69,11 +238,7 @@ class CosmicSimulation:
         
         if position is None:
             # Random position in 3D space
-            position = (
-                random.uniform(-1000, 1000),
-                random.uniform(-1000, 1000), 
-                random.uniform(-1000, 1000)
-            )
+            position = self._rng.uniform(-1000, 1000, size=3)
         
         # Create the world for this planet
         world = World(size[0], size[1])
@@ -87,7 +252,6 @@ class CosmicSimulation:
             name=name,
             planet_type=planet_type,
             world=world,
-            position=position,
             native_materials=native_materials,
             environmental_conditions=conditions,
             discovery_bonus_multiplier=discovery_multiplier
@@ -97,141 +261,55 @@ class CosmicSimulation:
         self._seed_planet_materials(planet)
         
         self.planets[planet_id] = planet
+        self._register_position(planet, position)
         return planet
     
+    def _register_position(self, planet: Planet, position: Tuple[float, float, float]):
+        """Store a planet's position in the positions array and point the planet at its row"""
+        index = self._planet_index.get(planet.id)
+        if index is None:
+            index = len(self._positions)
+            if index == len(self._position_buf):
+                self._position_buf = np.concatenate([self._position_buf, np.empty_like(self._position_buf)])
+            self._positions = self._position_buf[:index + 1]
+            self._planet_index[planet.id] = index
+            self._planet_ids.append(planet.id)
+        
+        self._positions[index] = position
+        planet._sim = self
+        planet._pos_index = index
+        self._distances = None
+        self._trade_candidates = None
+    
     def _generate_planet_characteristics(self, planet_type: PlanetType) -> Tuple[List[UniverseObject], Dict[str, float], float]:
         """Generate materials and conditions specific to planet type"""
+        material_specs, overrides, discovery_multiplier = _PLANET_PROFILES.get(planet_type, ((), {}, 1.0))
         
-        materials = []
-        conditions = {"temperature": 20.0, "pressure": 1.0, "radiation": 0.0, "magnetic_field": 0.1}
-        discovery_multiplier = 1.0
-        
-        if planet_type == PlanetType.TERRAN:
-            materials = [
-                UniverseObject("Piedra Terrestre", ["es_duro", "es_pesado"]),
-                UniverseObject("Madera Nativa", ["es_organico", "es_fragil", "es_inflamable"]),
-                UniverseObject("Agua Pura", ["es_solvente", "es_humedo"]),
-                UniverseObject("Mineral de Hierro", ["es_duro", "es_magnetico"]),
-                UniverseObject("Planta Medicinal", ["es_organico", "es_curativo"])
-            ]
-            conditions.update({"temperature": 25.0, "pressure": 1.0, "radiation": 0.1})
-        
-        elif planet_type == PlanetType.VOLCANIC:
-            materials = [
-                UniverseObject("Obsidiana", ["es_cortante", "es_fragil", "es_cristalino"]),
-                UniverseObject("Azufre Volcánico", ["es_acido", "es_reactivo", "es_explosivo"]),
-                UniverseObject("Lava Solidificada", ["es_duro", "retiene_calor", "es_caliente"]),
-                UniverseObject("Gas Volcánico", ["es_toxico", "es_caliente", "es_reactivo"]),
-                UniverseObject("Cristal de Magma", ["es_cristalino", "es_caliente", "brilla"])
-            ]
-            conditions.update({"temperature": 80.0, "pressure": 1.5, "radiation": 0.3})
-            discovery_multiplier = 1.3  # Heat accelerates reactions
-        
-        elif planet_type == PlanetType.ICE:
-            materials = [
-                UniverseObject("Hielo Eterno", ["es_duro", "es_frio", "es_cristalino"]),
-                UniverseObject("Cristal de Nitrógeno", ["es_frio", "es_cristalino", "es_fragil"]),
-                UniverseObject("Permafrost Orgánico", ["es_organico", "es_frio", "es_preservativo"]),
-                UniverseObject("Hielo Metálico", ["es_duro", "es_frio", "conduce_electricidad"]),
-                UniverseObject("Vapor Helado", ["es_frio", "es_viscoso", "absorbe_calor"])
-            ]
-            conditions.update({"temperature": -40.0, "pressure": 0.3, "radiation": 0.05})
-            discovery_multiplier = 0.7  # Cold slows reactions
-        
-        elif planet_type == PlanetType.GAS_GIANT:
-            materials = [
-                UniverseObject("Gas Noble", ["es_estable", "brilla", "es_liviano"]),
-                UniverseObject("Cristal Flotante", ["es_cristalino", "es_liviano", "vibra"]),
-                UniverseObject("Plasma Frío", ["brilla", "conduce_electricidad", "genera_campo"]),
-                UniverseObject("Núcleo Energético", ["genera_campo", "es_radioactivo", "vibra"]),
-                UniverseObject("Éter Condensado", ["es_liviano", "absorbe_luz", "es_viscoso"])
-            ]
-            conditions.update({"temperature": 15.0, "pressure": 0.1, "radiation": 0.8, "magnetic_field": 2.0})
-            discovery_multiplier = 1.5  # High energy environment
-        
-        elif planet_type == PlanetType.DESERT:
-            materials = [
-                UniverseObject("Arena Silícea", ["es_abrasivo", "es_cristalino", "absorbe_calor"]),
-                UniverseObject("Sal Mineral", ["es_cristalino", "es_solvente", "es_estable"]),
-                UniverseObject("Cactus Resistente", ["es_organico", "es_nutritivo", "retiene_agua"]),
-                UniverseObject("Piedra Porosa", ["es_liviano", "absorbe_agua", "es_fragil"]),
-                UniverseObject("Viento Seco", ["es_abrasivo", "es_caliente", "es_liviano"])
-            ]
-            conditions.update({"temperature": 50.0, "pressure": 0.8, "radiation": 0.6})
-        
-        elif planet_type == PlanetType.OCEAN:
-            materials = [
-                UniverseObject("Agua Salada", ["es_solvente", "conduce_electricidad", "es_humedo"]),
-                UniverseObject("Alga Bioluminiscente", ["es_organico", "brilla", "es_nutritivo"]),
-                UniverseObject("Concha Nácarada", ["es_duro", "es_cristalino", "es_organico"]),
-                UniverseObject("Coral Viviente", ["es_vivo", "es_cristalino", "es_organico"]),
-                UniverseObject("Perla Energética", ["brilla", "genera_campo", "es_cristalino"])
-            ]
-            conditions.update({"temperature": 18.0, "pressure": 2.0, "radiation": 0.2})
-            discovery_multiplier = 1.2  # Water accelerates organic reactions
-        
-        elif planet_type == PlanetType.CRYSTAL:
-            materials = [
-                UniverseObject("Cuarzo Resonante", ["es_cristalino", "vibra", "es_piezoelectrico"]),
-                UniverseObject("Diamante Conductor", ["es_duro", "conduce_electricidad", "es_cristalino"]),
-                UniverseObject("Cristal Amplificador", ["es_cristalino", "brilla", "genera_campo"]),
-                UniverseObject("Geoda Energética", ["es_cristalino", "genera_campo", "absorbe_luz"]),
-                UniverseObject("Prisma Cuántico", ["es_cristalino", "absorbe_luz", "genera_campo"])
-            ]
-            conditions.update({"temperature": 10.0, "pressure": 1.2, "radiation": 0.4, "magnetic_field": 0.5})
-            discovery_multiplier = 1.8  # Crystals amplify energy interactions
-        
-        elif planet_type == PlanetType.TOXIC:
-            materials = [
-                UniverseObject("Ácido Alienígena", ["es_acido", "es_toxico", "es_reactivo"]),
-                UniverseObject("Esporas Tóxicas", ["es_toxico", "es_organico", "es_venenoso"]),
-                UniverseObject("Metal Corrosivo", ["es_duro", "es_toxico", "es_reactivo"]),
-                UniverseObject("Gas Mutagénico", ["es_toxico", "es_reactivo", "es_psicoactivo"]),
-                UniverseObject("Cristal Venenoso", ["es_cristalino", "es_toxico", "brilla"])
-            ]
-            conditions.update({"temperature": 35.0, "pressure": 1.3, "radiation": 1.2})
-            discovery_multiplier = 2.0  # Extreme conditions create exotic reactions
-        
-        elif planet_type == PlanetType.MAGNETIC:
-            materials = [
-                UniverseObject("Hierro Magnético", ["es_magnetico", "es_duro", "conduce_electricidad"]),
-                UniverseObject("Superconductor Natural", ["es_superconductor", "conduce_electricidad", "es_frio"]),
-                UniverseObject("Campo Cristalizado", ["genera_campo", "es_cristalino", "es_magnetico"]),
-                UniverseObject("Bobina Orgánica", ["conduce_electricidad", "es_organico", "es_flexible"]),
-                UniverseObject("Plasma Magnético", ["brilla", "es_magnetico", "genera_campo"])
-            ]
-            conditions.update({"magnetic_field": 5.0, "radiation": 0.8})
-            discovery_multiplier = 1.6  # Magnetic fields enhance electrical discoveries
-        
-        elif planet_type == PlanetType.QUANTUM:
-            materials = [
-                UniverseObject("Materia Oscura Simulada", ["absorbe_luz", "genera_campo", "es_frio"]),
-                UniverseObject("Partícula Entrelazada", ["genera_campo", "vibra", "es_liviano"]),
-                UniverseObject("Vacío Cristalizado", ["es_cristalino", "absorbe_luz", "genera_campo"]),
-                UniverseObject("Energía Pura", ["brilla", "genera_campo", "es_liviano"]),
-                UniverseObject("Anomalía Temporal", ["vibra", "genera_campo", "absorbe_luz"])
-            ]
-            conditions.update({"radiation": 2.0, "magnetic_field": 3.0, "pressure": 0.05})
-            discovery_multiplier = 3.0  # Quantum effects create breakthrough discoveries
-        
-        return materials, conditions, discovery_multiplier
+        # Every planet gets its own objects, since interactions modify them
+        materials = [UniverseObject(name, list(properties)) for name, properties in material_specs]
+        return materials, {**_BASE_CONDITIONS, **overrides}, discovery_multiplier
     
     def _seed_planet_materials(self, planet: Planet):
         """Scatter native materials across the planet surface"""
         world = planet.world
+        materials = planet.native_materials
         materials_per_spawn = 3  # How many materials to place
-        
-        for _ in range(materials_per_spawn * len(planet.native_materials)):
-            x = random.randint(0, world.width - 1)
-            y = random.randint(0, world.height - 1)
-            
-            # Only place materials in empty spaces
-            if world.grid[y][x] is None:
-                material = random.choice(planet.native_materials)
-                # Materials don't occupy grid spaces but can be found by cells
-                if not hasattr(world, 'scattered_materials'):
-                    world.scattered_materials = {}
-                world.scattered_materials[(x, y)] = material
+        if not materials:
+            return
+        
+        rng = self._rng
+        count = materials_per_spawn * len(materials)
+        xs = rng.integers(0, world.width, count)
+        ys = rng.integers(0, world.height, count)
+        picks = rng.integers(0, len(materials), count)
+        
+        # Only place materials in empty spaces
+        keep = world.type_grid[ys + 1, xs + 1] == 0
+        
+        # Materials don't occupy grid spaces but can be found by cells
+        scattered = world.scattered_materials
+        for x, y, pick in zip(xs[keep].tolist(), ys[keep].tolist(), picks[keep].tolist()):
+            scattered[(x, y)] = materials[pick]
     
     def step_all_planets(self):
         """Advance simulation on all planets simultaneously"""
@@ -239,10 +317,19 @@ class CosmicSimulation:
         
         discoveries_this_step = []
         
-        # Step each planet
+        # Start the tick on every planet, then plan all their creatures' moves in one batch
+        started = []
         for planet in self.planets.values():
-            planet.world.step_count = self.step_count
-            planet.world.step()
+            world = planet.world
+            world.step_count = self.step_count + 1  # As World.step() counts it
+            cells_to_update, thinking_cells = world.begin_update()
+            started.append((planet, cells_to_update, thinking_cells))
+        
+        CellBrain.plan_actions_batched([(thinking_cells, planet.world)
+                                        for planet, _, thinking_cells in started])
+        
+        for planet, cells_to_update, _ in started:
+            planet.world.finish_update(cells_to_update)
             
             # Check for new discoveries on this planet
             planet_discoveries = self._check_planet_discoveries(planet)
@@ -267,112 +354,107 @@ class CosmicSimulation:
     
     def _process_cosmic_events(self):
         """Process active cosmic events and spawn new ones"""
-        # Remove expired events
-        self.active_cosmic_events = [
-            event for event in self.active_cosmic_events 
-            if event.duration_ticks > 0
-        ]
-        
-        # Decrease duration on active events
-        for event in self.active_cosmic_events:
-            event.duration_ticks -= 1
+        # Remove expired events and decrease duration on the rest
+        if self.active_cosmic_events:
+            survivors = []
+            for event in self.active_cosmic_events:
+                if event.duration_ticks > 0:
+                    event.duration_ticks -= 1
+                    survivors.append(event)
+            self.active_cosmic_events = survivors
         
         # Chance to spawn new cosmic event
-        if random.random() < 0.01:  # 1% chance per step
+        if self._rng.random() < 0.01:  # 1% chance per step
             self._spawn_cosmic_event()
     
     def _spawn_cosmic_event(self):
         """Spawn a random cosmic event"""
-        events = [
-            CosmicEvent(
-                name="Tormenta Solar",
-                description="Radiación intensa afecta materiales electromagnéticos",
-                affected_planets=random.sample(list(self.planets.keys()), 
-                                             min(3, len(self.planets))),
-                duration_ticks=50,
-                effects={"radiation_boost": 2.0, "magnetic_interference": 1.5}
-            ),
-            CosmicEvent(
-                name="Alineación Cuántica",
-                description="Efectos cuánticos intensificados en múltiples mundos",
-                affected_planets=list(self.planets.keys()),
-                duration_ticks=20,
-                effects={"discovery_multiplier": 2.5, "exotic_materials": True}
-            ),
-            CosmicEvent(
-                name="Lluvia de Meteoritos",
-                description="Nuevos materiales extraterrestres llegan",
-                affected_planets=random.sample(list(self.planets.keys()), 
-                                             min(2, len(self.planets))),
-                duration_ticks=30,
-                effects={"new_materials": True, "impact_damage": 0.1}
-            )
-        ]
-        
         if self.planets:
-            event = random.choice(events)
+            name, description, duration, effects, sample_size = _EVENT_TEMPLATES[self._rng.integers(len(_EVENT_TEMPLATES))]
+            planet_ids = self._planet_ids
+            if sample_size is None:
+                affected = list(planet_ids)
+            else:
+                affected = self._rng.choice(planet_ids, size=min(sample_size, len(planet_ids)), replace=False).tolist()
+            
+            event = CosmicEvent(name, description, affected, duration, dict(effects))
             self.active_cosmic_events.append(event)
-            print(f"🌌 EVENTO CÓSMICO: {event.name} - {event.description}")
+            logger.info("🌌 EVENTO CÓSMICO: %s - %s", event.name, event.description)
     
     def _process_interplanetary_interactions(self):
         """Handle trade and communication between planets"""
-        # Calculate distances and establish trade routes
-        planet_ids = list(self.planets.keys())
-        
-        for i, planet1_id in enumerate(planet_ids):
-            for planet2_id in planet_ids[i+1:]:
-                distance = self._calculate_distance(planet1_id, planet2_id)
-                
-                # Establish trade routes for nearby planets
-                if distance < 500 and random.random() < 0.05:  # 5% chance
-                    planet1 = self.planets[planet1_id]
-                    planet2 = self.planets[planet2_id]
-                    
-                    if planet2_id not in planet1.trade_routes:
-                        planet1.trade_routes.append(planet2_id)
-                    if planet1_id not in planet2.trade_routes:
-                        planet2.trade_routes.append(planet1_id)
-                        
-                    print(f"🚀 Nueva ruta comercial: {planet1.name} ↔ {planet2.name}")
+        # Establish trade routes for nearby planets, 5% chance per pair
+        candidates = self._trade_pairs()
+        if not len(candidates):
+            return
+        
+        planet_ids = self._planet_ids
+        opened = candidates[self._rng.random(len(candidates)) < 0.05]
+        
+        log_routes = logger.isEnabledFor(logging.INFO)
+        for i, j in opened.tolist():
+            planet1_id, planet2_id = planet_ids[i], planet_ids[j]
+            planet1 = self.planets[planet1_id]
+            planet2 = self.planets[planet2_id]
+            
+            planet1.trade_routes.add(planet2_id)
+            planet2.trade_routes.add(planet1_id)
+            
+            if log_routes:
+                logger.info("🚀 Nueva ruta comercial: %s ↔ %s", planet1.name, planet2.name)
+    
+    def _distance_matrix(self) -> np.ndarray:
+        """Get the (N, N) matrix of 3D distances between planets, indexed like _planet_ids"""
+        if self._distances is None:
+            delta = self._positions[:, None, :] - self._positions[None, :, :]
+            self._distances = np.sqrt((delta ** 2).sum(axis=-1))
+        return self._distances
+    
+    def _trade_pairs(self) -> np.ndarray:
+        """Get the (i, j) row pairs, i < j, of planets within TRADE_DISTANCE of each other"""
+        if self._trade_candidates is None:
+            if _trade_eligibility_nb is not None:
+                in_range = _trade_eligibility_nb(self._positions, self.TRADE_DISTANCE)
+            else:
+                in_range = np.triu(self._distance_matrix() < self.TRADE_DISTANCE, k=1)
+            self._trade_candidates = np.argwhere(in_range)
+        return self._trade_candidates
     
     def _calculate_distance(self, planet1_id: str, planet2_id: str) -> float:
         """Calculate 3D distance between two planets"""
-        p1_pos = self.planets[planet1_id].position
-        p2_pos = self.planets[planet2_id].position
+        i, j = self._planet_index[planet1_id], self._planet_index[planet2_id]
+        if self._distances is not None:
+            return float(self._distances[i, j])
         
-        return np.sqrt(
-            (p1_pos[0] - p2_pos[0])**2 + 
-            (p1_pos[1] - p2_pos[1])**2 + 
-            (p1_pos[2] - p2_pos[2])**2
-        )
+        # Don't build the whole matrix for a single lookup
+        return math.dist(self._positions[i].tolist(), self._positions[j].tolist())
     
     def _share_cosmic_knowledge(self, discoveries: List[Any]):
         """Share breakthrough discoveries across connected planets"""
         for discovery in discoveries:
             # Major discoveries spread across trade networks
             if hasattr(discovery, 'significance') and discovery.significance > 15:
-                print(f"🌍 DESCUBRIMIENTO CÓSMICO COMPARTIDO: {discovery.name}")
+                logger.info("🌍 DESCUBRIMIENTO CÓSMICO COMPARTIDO: %s", discovery.name)
                 # Implementation would spread discovery to connected planets
     
     def get_cosmic_status(self) -> str:
         """Get status report of the cosmic simulation"""
-        report = f"🌌 ESTADO CÓSMICO - Tick {self.step_count}\n"
-        report += "=" * 50 + "\n"
+        parts = [f"🌌 ESTADO CÓSMICO - Tick {self.step_count}\n", "=" * 50 + "\n"]
         
         # Planet status
         for planet in self.planets.values():
-            cell_count = sum(1 for row in planet.world.grid for cell in row if cell is not None)
-            report += f"🪐 {planet.name} ({planet.planet_type.value}): {cell_count} células\n"
-            report += f"   Temperatura: {planet.environmental_conditions['temperature']:.1f}°C\n"
-            report += f"   Rutas comerciales: {len(planet.trade_routes)}\n"
+            cell_count = planet.world.count_cells()
+            parts.append(f"🪐 {planet.name} ({planet.planet_type}): {cell_count} células\n"
+                         f"   Temperatura: {planet.environmental_conditions['temperature']:.1f}°C\n"
+                         f"   Rutas comerciales: {len(planet.trade_routes)}\n")
         
         # Active events
         if self.active_cosmic_events:
-            report += "\n⚡ EVENTOS ACTIVOS:\n"
-            for event in self.active_cosmic_events:
-                report += f"   • {event.name} ({event.duration_ticks} ticks restantes)\n"
+            parts.append("\n⚡ EVENTOS ACTIVOS:\n")
+            parts.extend(f"   • {event.name} ({event.duration_ticks} ticks restantes)\n"
+                         for event in self.active_cosmic_events)
         
-        return report
+        return ''.join(parts)
     
     def populate_planet(self, planet_id: str, plants: int = 50, herbivores: int = 15, carnivores: int = 5):
         """Populate a planet with initial life forms"""
@@ -406,6 +488,7 @@ def create_example_solar_system() -> CosmicSimulation:
 
 if __name__ == "__main__":
     # Test the cosmic simulation
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🌌 INICIANDO SIMULACIÓN CÓSMICA")
     cosmic = create_example_solar_system()
     
@@ -1,11 +1,36 @@
-from typing import Dict, List, Set, Optional, Any, Tuple
+from typing import Dict, List, Set, FrozenSet, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+from itertools import islice
+import heapq
 import json
 from datetime import datetime
 from .objects import UniverseObject, CombinationResult
 from .interactions import InteractionType
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
+
+# Properties that make an object usable as a tool, and what each one lets a tool do
+TOOL_PROPERTIES = frozenset({"es_puntiagudo", "es_cortante", "es_duro"})
+CAPABILITY_MAP = (
+    ("es_puntiagudo", "piercing"),
+    ("es_cortante", "cutting"),
+    ("es_duro", "striking"),
+    ("brilla", "illumination"),
+)
+
+@lru_cache(maxsize=4096)
+def _tool_kind(properties: FrozenSet[str]) -> Tuple[bool, str]:
+    """Whether a set of property names makes a functional tool, and what such a tool can do"""
+    is_tool = not TOOL_PROPERTIES.isdisjoint(properties)
+    capabilities = ", ".join(cap for prop, cap in CAPABILITY_MAP if prop in properties) or "unknown"
+    return is_tool, capabilities
+
 class DiscoveryType(Enum):
     """Types of discoveries that can be made"""
     NEW_OBJECT = "new_object"                    # A completely new type of object
@@ -16,7 +41,10 @@ class DiscoveryType(Enum):
     PROPERTY_COMBINATION = "property_combination" # New property combinations
     BREAKTHROUGH = "breakthrough"                # Major significant discovery
 
-@dataclass
+# Report heading for each discovery type, e.g. "Tool Creation"
+_TYPE_DISPLAY = {t: t.value.replace('_', ' ').title() for t in DiscoveryType}
+
+@dataclass(slots=True)
 class Discovery:
     """Represents a significant discovery in the universe"""
     id: str
@@ -26,11 +54,35 @@ class Discovery:
     significance: float
     objects_involved: List[str] = field(default_factory=list)
     properties_involved: List[str] = field(default_factory=list)
-    interaction_sequence: List[str] = field(default_factory=list)
+    interaction_sequence: Tuple[str, ...] = ()
     timestamp: int = 0
-    discoverer_id: Optional[str] = None  # Which cell/entity made this discovery
+    discoverer_id: Optional[int] = None  # Id of the cell/entity that made this discovery
     reproducible: bool = False           # Can this be reproduced reliably?
     applications: List[str] = field(default_factory=list)  # What uses has this been put to?
+    serial: int = 0                      # Unique number, usable as a bit index
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize discovery to dictionary"""
+        return {
+            'id': self.id,
+            'type': self.discovery_type.value,
+            'name': self.name,
+            'description': self.description,
+            'significance': self.significance,
+            'objects_involved': self.objects_involved,
+            'properties_involved': self.properties_involved,
+            'timestamp': self.timestamp,
+            'discoverer_id': self.discoverer_id,
+            'reproducible': self.reproducible,
+            'applications': self.applications
+        }
+
+@dataclass(slots=True)
+class ObjectPattern:
+    """How often an object signature has been created, and how"""
+    first_seen: int
+    times_created: int = 1
+    creation_methods: List[str] = field(default_factory=list)
 
 class DiscoveryDetector:
     """Detects when significant discoveries are made"""
@@ -38,55 +90,89 @@ class DiscoveryDetector:
     def __init__(self, significance_threshold: float = 5.0):
         self.significance_threshold = significance_threshold
         self.discoveries = {}  # Dict[str, Discovery]
-        self.object_patterns = {}  # Track what objects are created from what
-        self.property_emergence = {}  # Track when new properties appear
-        self.interaction_chains = []  # Track sequences of interactions
+        self._discoveries_by_name = {}  # Dict[str, Discovery], first discovery with each name
+        self.object_patterns = {}  # Dict[str, ObjectPattern], what objects are created from what
+        self.property_emergence = defaultdict(dict)  # obj name -> prop name -> (first seen tick, context, significance)
+        self.interaction_chains = deque(maxlen=20)  # Track the most recent interactions
         self.next_discovery_id = 1
+        
+        # Running tallies so summaries don't rescan every discovery
+        self._discoverer_counts = Counter()  # discoverer_id -> discoveries made
+        self._type_counts = Counter()  # DiscoveryType -> discoveries of that type
+        self._reproducible_count = 0
+        self._property_emergence_count = 0
+    
+    @property
+    def significance_threshold(self) -> float:
+        """Minimum result significance for a discovery"""
+        return self._significance_threshold
+    
+    @significance_threshold.setter
+    def significance_threshold(self, value: float):
+        self._significance_threshold = value
+        self._property_threshold = value * 0.8  # New properties need a bit less
+        self._breakthrough_threshold = value * 2  # Breakthroughs need double
+    
+    def _next_id(self, prefix: str) -> Tuple[int, str]:
+        """Take the next discovery serial and format its ID with the given prefix"""
+        serial = self.next_discovery_id
+        self.next_discovery_id += 1
+        return serial, "%s_%04d" % (prefix, serial)
     
     def analyze_interaction_result(self, result: CombinationResult, 
-                                 tick: int = 0, discoverer_id: str = None) -> Optional[Discovery]:
+                                 tick: int = 0, discoverer_id: Optional[int] = None) -> Optional[Discovery]:
         """Analyze a result to see if it represents a significant discovery"""
         
-        if not result.success or result.significance_score < self.significance_threshold:
+        if not result.success or result.significance_score < self._significance_threshold:
             return None
         
         discovery = None
         
+        # Classify each new object as a tool (or not) once for all checks below
+        tool_kinds = [_tool_kind(obj.prop_names) for obj in result.new_objects]
+        
         # Check for new object creation
         if result.new_objects:
-            discovery = self._detect_new_object_discovery(result, tick, discoverer_id)
+            discovery = self._detect_new_object_discovery(result, tick, discoverer_id, tool_kinds)
         
         # Check for new property combinations
         elif result.modified_objects:
             discovery = self._detect_property_discovery(result, tick, discoverer_id)
         
         # Check for tool creation patterns
-        if discovery is None and self._is_tool_creation(result):
-            discovery = self._detect_tool_discovery(result, tick, discoverer_id)
+        if discovery is None and self._is_tool_creation(tool_kinds):
+            discovery = self._detect_tool_discovery(result, tick, discoverer_id, tool_kinds)
         
         if discovery:
             self.discoveries[discovery.id] = discovery
+            self._discoveries_by_name.setdefault(discovery.name, discovery)
             self._update_knowledge_base(discovery, result)
+            
+            self._type_counts[discovery.discovery_type] += 1
+            if discovery.discoverer_id is not None:
+                self._discoverer_counts[discovery.discoverer_id] += 1
         
         return discovery
     
-    def _detect_new_object_discovery(self, result: CombinationResult, 
-                                   tick: int, discoverer_id: str) -> Optional[Discovery]:
+    def _detect_new_object_discovery(self, result: CombinationResult, tick: int, discoverer_id: Optional[int],
+                                   tool_kinds: List[Tuple[bool, str]]) -> Optional[Discovery]:
         """Detect when a truly new type of object is created"""
         
-        for new_obj in result.new_objects:
-            object_signature = self._get_object_signature(new_obj)
+        for new_obj, (is_tool, _) in zip(result.new_objects, tool_kinds):
+            object_signature = new_obj.signature
             
             # Check if we've seen this combination of properties before
             if object_signature not in self.object_patterns:
-                discovery_id = f"DISC_{self.next_discovery_id:04d}"
-                self.next_discovery_id += 1
+                serial, discovery_id = self._next_id("DISC")
                 
-                # Determine discovery type based on object properties
-                discovery_type = self._classify_object_discovery(new_obj)
+                # Determine discovery type: tools first, then complex objects
+                discovery_type = (DiscoveryType.TOOL_CREATION if is_tool else
+                                  DiscoveryType.COMPOUND_CREATION if len(new_obj.properties) > 3 else
+                                  DiscoveryType.NEW_OBJECT)
                 
                 discovery = Discovery(
                     id=discovery_id,
+                    serial=serial,
                     discovery_type=discovery_type,
                     name=f"Discovery of {new_obj.name}",
                     description=f"Created {new_obj.name} with properties: {list(new_obj.properties.keys())}",
@@ -99,30 +185,30 @@ class DiscoveryDetector:
                 )
                 
                 # Track the pattern for future reference
-                self.object_patterns[object_signature] = {
-                    'first_seen': tick,
-                    'times_created': 1,
-                    'creation_methods': [result.description]
-                }
+                self.object_patterns[object_signature] = ObjectPattern(
+                    first_seen=tick,
+                    creation_methods=[result.description]
+                )
                 
                 return discovery
             else:
                 # This pattern exists, but increment creation count
-                self.object_patterns[object_signature]['times_created'] += 1
-                if result.description not in self.object_patterns[object_signature]['creation_methods']:
-                    self.object_patterns[object_signature]['creation_methods'].append(result.description)
+                pattern = self.object_patterns[object_signature]
+                pattern.times_created += 1
+                if result.description not in pattern.creation_methods:
+                    pattern.creation_methods.append(result.description)
                 
-                # If created multiple times, mark as reproducible
-                if self.object_patterns[object_signature]['times_created'] >= 3:
-                    for disc in self.discoveries.values():
-                        if disc.name == f"Discovery of {new_obj.name}":
-                            disc.reproducible = True
-                            break
+                # Mark as reproducible the first time it has been created enough times
+                if pattern.times_created == 3:
+                    disc = self._discoveries_by_name.get(f"Discovery of {new_obj.name}")
+                    if disc is not None and not disc.reproducible:
+                        disc.reproducible = True
+                        self._reproducible_count += 1
         
         return None
     
     def _detect_property_discovery(self, result: CombinationResult, 
-                                  tick: int, discoverer_id: str) -> Optional[Discovery]:
+                                  tick: int, discoverer_id: Optional[int]) -> Optional[Discovery]:
         """Detect when objects gain new or unusual property combinations"""
         
         for obj in result.modified_objects:
@@ -130,52 +216,46 @@ class DiscoveryDetector:
             new_properties = []
             
             # This is simplified - in practice we'd track object history
-            state_properties = [name for name, prop in obj.properties.items() 
-                              if not prop.is_permanent]
+            emerged = self.property_emergence[obj.name]
+            for prop_name, prop in obj.properties.items():
+                if not prop.is_permanent and prop_name not in emerged:
+                    emerged[prop_name] = (tick, result.description, result.significance_score)
+                    new_properties.append(prop_name)
+            
+            self._property_emergence_count += len(new_properties)
             
-            if state_properties:
-                for prop_name in state_properties:
-                    prop_key = f"{obj.name}_{prop_name}"
-                    if prop_key not in self.property_emergence:
-                        self.property_emergence[prop_key] = {
-                            'first_seen': tick,
-                            'context': result.description,
-                            'significance': result.significance_score
-                        }
-                        new_properties.append(prop_name)
+            if new_properties and result.significance_score > self._property_threshold:
+                serial, discovery_id = self._next_id("PROP")
                 
-                if new_properties and result.significance_score > self.significance_threshold * 0.8:
-                    discovery_id = f"PROP_{self.next_discovery_id:04d}"
-                    self.next_discovery_id += 1
-                    
-                    return Discovery(
-                        id=discovery_id,
-                        discovery_type=DiscoveryType.PROPERTY_COMBINATION,
-                        name=f"New properties on {obj.name}",
-                        description=f"{obj.name} gained: {', '.join(new_properties)}",
-                        significance=result.significance_score,
-                        objects_involved=[obj.name],
-                        properties_involved=new_properties,
-                        timestamp=tick,
-                        discoverer_id=discoverer_id
-                    )
+                return Discovery(
+                    id=discovery_id,
+                    serial=serial,
+                    discovery_type=DiscoveryType.PROPERTY_COMBINATION,
+                    name=f"New properties on {obj.name}",
+                    description=f"{obj.name} gained: {', '.join(new_properties)}",
+                    significance=result.significance_score,
+                    objects_involved=[obj.name],
+                    properties_involved=new_properties,
+                    timestamp=tick,
+                    discoverer_id=discoverer_id
+                )
         
         return None
     
-    def _detect_tool_discovery(self, result: CombinationResult, 
-                              tick: int, discoverer_id: str) -> Optional[Discovery]:
+    def _detect_tool_discovery(self, result: CombinationResult, tick: int, discoverer_id: Optional[int],
+                              tool_kinds: List[Tuple[bool, str]]) -> Optional[Discovery]:
         """Detect when a functional tool is created"""
         
-        for new_obj in result.new_objects:
-            if self._is_functional_tool(new_obj):
-                discovery_id = f"TOOL_{self.next_discovery_id:04d}"
-                self.next_discovery_id += 1
+        for new_obj, (is_tool, capabilities) in zip(result.new_objects, tool_kinds):
+            if is_tool:
+                serial, discovery_id = self._next_id("TOOL")
                 
                 return Discovery(
                     id=discovery_id,
+                    serial=serial,
                     discovery_type=DiscoveryType.TOOL_CREATION,
                     name=f"Tool Creation: {new_obj.name}",
-                    description=f"Functional tool created with capabilities: {self._describe_tool_capabilities(new_obj)}",
+                    description=f"Functional tool created with capabilities: {capabilities}",
                     significance=result.significance_score + 5.0,  # Tools are extra significant
                     objects_involved=[obj.name for obj in result.modified_objects + result.destroyed_objects],
                     properties_involved=list(new_obj.properties.keys()),
@@ -185,63 +265,25 @@ class DiscoveryDetector:
         
         return None
     
-    def _get_object_signature(self, obj: UniverseObject) -> str:
-        """Create a unique signature for an object based on its properties"""
-        props = sorted(obj.properties.keys())
-        return f"{obj.name}::{':'.join(props)}"
-    
-    def _classify_object_discovery(self, obj: UniverseObject) -> DiscoveryType:
-        """Classify what type of discovery this object represents"""
-        
-        if self._is_functional_tool(obj):
-            return DiscoveryType.TOOL_CREATION
-        elif len(obj.properties) > 3:  # Complex object
-            return DiscoveryType.COMPOUND_CREATION
-        else:
-            return DiscoveryType.NEW_OBJECT
-    
-    def _is_tool_creation(self, result: CombinationResult) -> bool:
-        """Check if this result represents tool creation"""
-        return any(self._is_functional_tool(obj) for obj in result.new_objects)
-    
-    def _is_functional_tool(self, obj: UniverseObject) -> bool:
-        """Determine if an object is a functional tool"""
-        tool_properties = ["es_puntiagudo", "es_cortante", "es_duro"]
-        return any(obj.has_property(prop) for prop in tool_properties)
-    
-    def _describe_tool_capabilities(self, tool: UniverseObject) -> str:
-        """Describe what a tool can do"""
-        capabilities = []
-        
-        if tool.has_property("es_puntiagudo"):
-            capabilities.append("piercing")
-        if tool.has_property("es_cortante"):
-            capabilities.append("cutting")
-        if tool.has_property("es_duro"):
-            capabilities.append("striking")
-        if tool.has_property("brilla"):
-            capabilities.append("illumination")
-        
-        return ", ".join(capabilities) if capabilities else "unknown"
+    def _is_tool_creation(self, tool_kinds: List[Tuple[bool, str]]) -> bool:
+        """Check if any new object in a result is a functional tool"""
+        return any(is_tool for is_tool, _ in tool_kinds)
     
     def _update_knowledge_base(self, discovery: Discovery, result: CombinationResult):
         """Update our knowledge base with this discovery"""
         
         # Track interaction chains that lead to discoveries
-        if len(self.interaction_chains) > 0:
-            discovery.interaction_sequence = self.interaction_chains[-5:]  # Last 5 interactions
+        chains = self.interaction_chains
+        if chains:
+            discovery.interaction_sequence = tuple(islice(chains, max(0, len(chains) - 5), None))  # Last 5 interactions
         
         # Mark breakthrough discoveries
-        if discovery.significance > self.significance_threshold * 2:
+        if discovery.significance > self._breakthrough_threshold:
             discovery.discovery_type = DiscoveryType.BREAKTHROUGH
     
     def record_interaction_chain(self, interaction_description: str):
         """Record an interaction in the chain"""
-        self.interaction_chains.append(interaction_description)
-        
-        # Keep only recent interactions
-        if len(self.interaction_chains) > 20:
-            self.interaction_chains = self.interaction_chains[-20:]
+        self.interaction_chains.append(interaction_description)  # deque drops the oldest past 20
     
     def get_discovery_by_id(self, discovery_id: str) -> Optional[Discovery]:
         """Get a specific discovery by ID"""
@@ -253,15 +295,11 @@ class DiscoveryDetector:
     
     def get_recent_discoveries(self, count: int = 10) -> List[Discovery]:
         """Get the most recent discoveries"""
-        sorted_discoveries = sorted(self.discoveries.values(), 
-                                  key=lambda d: d.timestamp, reverse=True)
-        return sorted_discoveries[:count]
+        return heapq.nlargest(count, self.discoveries.values(), key=lambda d: d.timestamp)
     
     def get_most_significant_discoveries(self, count: int = 10) -> List[Discovery]:
         """Get the most significant discoveries"""
-        sorted_discoveries = sorted(self.discoveries.values(), 
-                                  key=lambda d: d.significance, reverse=True)
-        return sorted_discoveries[:count]
+        return heapq.nlargest(count, self.discoveries.values(), key=lambda d: d.significance)
     
     def mark_discovery_application(self, discovery_id: str, application: str):
         """Mark how a discovery has been applied/used"""
@@ -274,43 +312,38 @@ class DiscoveryDetector:
         if not self.discoveries:
             return "=== DISCOVERY REPORT ===\nNo discoveries made yet.\n"
         
-        report = "=== DISCOVERY REPORT ===\n\n"
+        parts = ["=== DISCOVERY REPORT ===\n\n"]
         
         # Summary statistics
-        total = len(self.discoveries)
-        by_type = {}
-        for disc in self.discoveries.values():
-            by_type[disc.discovery_type.value] = by_type.get(disc.discovery_type.value, 0) + 1
-        
-        report += f"Total Discoveries: {total}\n"
-        report += "By Type:\n"
-        for disc_type, count in by_type.items():
-            report += f"  {disc_type.replace('_', ' ').title()}: {count}\n"
-        report += "\n"
+        parts.append(f"Total Discoveries: {len(self.discoveries)}\n")
+        parts.append("By Type:\n")
+        for disc_type, count in self._type_counts.items():
+            parts.append(f"  {_TYPE_DISPLAY[disc_type]}: {count}\n")
+        parts.append("\n")
         
         # Most significant discoveries
         significant = self.get_most_significant_discoveries(5)
-        report += "=== MOST SIGNIFICANT DISCOVERIES ===\n"
+        parts.append("=== MOST SIGNIFICANT DISCOVERIES ===\n")
         for disc in significant:
-            report += f"\n{disc.name} (ID: {disc.id})\n"
-            report += f"  Type: {disc.discovery_type.value.replace('_', ' ').title()}\n"
-            report += f"  Significance: {disc.significance:.1f}\n"
-            report += f"  Description: {disc.description}\n"
+            parts.append(f"\n{disc.name} (ID: {disc.id})\n"
+                         f"  Type: {_TYPE_DISPLAY[disc.discovery_type]}\n"
+                         f"  Significance: {disc.significance:.1f}\n"
+                         f"  Description: {disc.description}\n")
             if disc.reproducible:
-                report += f"  Status: REPRODUCIBLE ✓\n"
+                parts.append("  Status: REPRODUCIBLE ✓\n")
             if disc.applications:
-                report += f"  Applications: {', '.join(disc.applications)}\n"
+                parts.append(f"  Applications: {', '.join(disc.applications)}\n")
         
         # Recent breakthroughs
         breakthroughs = self.get_discoveries_by_type(DiscoveryType.BREAKTHROUGH)
         if breakthroughs:
-            report += "\n=== BREAKTHROUGH DISCOVERIES ===\n"
+            parts.append("\n=== BREAKTHROUGH DISCOVERIES ===\n")
             for disc in breakthroughs:
-                report += f"\n🎉 {disc.name}\n"
-                report += f"   {disc.description}\n"
-                report += f"   Significance: {disc.significance:.1f}\n"
+                parts.append(f"\n🎉 {disc.name}\n"
+                             f"   {disc.description}\n"
+                             f"   Significance: {disc.significance:.1f}\n")
         
-        return report
+        return "".join(parts)
     
     def export_discoveries_to_json(self, filename: str):
         """Export all discoveries to a JSON file"""
@@ -320,47 +353,31 @@ class DiscoveryDetector:
                 'total_discoveries': len(self.discoveries),
                 'next_id': self.next_discovery_id
             },
-            'discoveries': {}
+            'discoveries': {disc_id: disc.to_dict() for disc_id, disc in self.discoveries.items()}
         }
         
-        for disc_id, disc in self.discoveries.items():
-            export_data['discoveries'][disc_id] = {
-                'id': disc.id,
-                'type': disc.discovery_type.value,
-                'name': disc.name,
-                'description': disc.description,
-                'significance': disc.significance,
-                'objects_involved': disc.objects_involved,
-                'properties_involved': disc.properties_involved,
-                'timestamp': disc.timestamp,
-                'discoverer_id': disc.discoverer_id,
-                'reproducible': disc.reproducible,
-                'applications': disc.applications
-            }
-        
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(export_data, f, indent=2)
     
     def get_knowledge_summary(self) -> Dict[str, Any]:
         """Get a summary of accumulated knowledge"""
         return {
             'total_discoveries': len(self.discoveries),
             'unique_object_patterns': len(self.object_patterns),
-            'property_emergences': len(self.property_emergence),
-            'reproducible_discoveries': len([d for d in self.discoveries.values() if d.reproducible]),
-            'breakthrough_count': len(self.get_discoveries_by_type(DiscoveryType.BREAKTHROUGH)),
+            'property_emergences': self._property_emergence_count,
+            'reproducible_discoveries': self._reproducible_count,
+            'breakthrough_count': self._type_counts[DiscoveryType.BREAKTHROUGH],
             'most_creative_discoverer': self._get_most_creative_discoverer()
         }
     
-    def _get_most_creative_discoverer(self) -> Optional[str]:
+    def _get_most_creative_discoverer(self) -> Optional[int]:
         """Find which entity has made the most discoveries"""
-        discoverer_counts = {}
-        for disc in self.discoveries.values():
-            if disc.discoverer_id:
-                discoverer_counts[disc.discoverer_id] = discoverer_counts.get(disc.discoverer_id, 0) + 1
-        
-        if discoverer_counts:
-            return max(discoverer_counts.items(), key=lambda x: x[1])[0]
+        if self._discoverer_counts:
+            return self._discoverer_counts.most_common(1)[0][0]
         return None
 
 # Global discovery system instance
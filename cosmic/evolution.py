@@ -1,8 +1,9 @@
-import random
-import statistics
+import numpy as np
 from typing import List, Dict, Tuple
 from .brain import CellBrain, NeuralNetwork
 
+_rng = np.random.default_rng()
+
 class EvolutionEngine:
     """Manages genetic algorithm for brain evolution across generations"""
     
@@ -25,11 +26,10 @@ class EvolutionEngine:
             # Create random initial population
             return [CellBrain() for _ in range(target_population)]
         
-        # Calculate fitness for all brains
-        self._calculate_fitness(dead_brains)
-        
-        # Record statistics
-        self._record_generation_stats(dead_brains)
+        # Gather per-brain traits once, then score and summarize them
+        traits = self._gather_traits(dead_brains)
+        fitness = self._calculate_fitness(dead_brains, traits)
+        self._record_generation_stats(traits, fitness)
         
         # Select elite survivors
         elite_brains = self._select_elite(dead_brains)
@@ -40,42 +40,44 @@ class EvolutionEngine:
         self.generation += 1
         return new_population
     
-    def _calculate_fitness(self, brains: List[CellBrain]):
-        """Calculate and normalize fitness scores"""
-        if not brains:
-            return
-        
-        # Calculate raw fitness
-        for brain in brains:
-            brain.fitness = self._calculate_raw_fitness(brain)
-        
-        # Normalize fitness scores (0-1 range)
-        fitnesses = [brain.fitness for brain in brains]
-        if len(set(fitnesses)) > 1:  # Avoid division by zero
-            min_fit = min(fitnesses)
-            max_fit = max(fitnesses)
-            for brain in brains:
-                brain.fitness = (brain.fitness - min_fit) / (max_fit - min_fit) if max_fit > min_fit else 0.5
+    def _gather_traits(self, brains: List[CellBrain]) -> np.ndarray:
+        """Collect (age at death, energy gained, offspring) per brain as an (n, 3) array"""
+        return np.array([(brain.age_at_death, brain.energy_gained, brain.offspring_count)
+                         for brain in brains], dtype=np.float64).reshape(-1, 3)
     
-    def _calculate_raw_fitness(self, brain: CellBrain) -> float:
-        """Calculate raw fitness score for a brain"""
-        fitness = 0.0
+    def _calculate_fitness(self, brains: List[CellBrain], traits: np.ndarray) -> np.ndarray:
+        """Calculate and normalize fitness scores, storing them on the brains"""
+        fitness = self._calculate_raw_fitness(traits[:, 0], traits[:, 1], traits[:, 2])
+        
+        # Normalize fitness scores (0-1 range), unless they are all equal
+        min_fit = fitness.min()
+        spread = fitness.max() - min_fit
+        if spread > 0:
+            fitness -= min_fit
+            fitness *= 1.0 / spread
         
+        for brain, value in zip(brains, fitness.tolist()):
+            brain.fitness = value
+        
+        return fitness
+    
+    def _calculate_raw_fitness(self, ages: np.ndarray, energy_gains: np.ndarray,
+                               offspring_counts: np.ndarray) -> np.ndarray:
+        """Calculate raw fitness scores from per-brain ages at death, energy gained and offspring"""
         # Survival time bonus (most important)
-        fitness += brain.age_at_death * 2.0
+        fitness = ages * 2.0
         
         # Energy management bonus
-        fitness += brain.energy_gained * 0.1
+        fitness += energy_gains * 0.1
         
         # Reproduction bonus (exponential reward)
-        fitness += brain.offspring_count ** 1.5 * 20.0
+        fitness += offspring_counts ** 1.5 * 20.0
         
         # Efficiency bonus (energy gained per age)
-        if brain.age_at_death > 0:
-            efficiency = brain.energy_gained / brain.age_at_death
-            fitness += efficiency * 5.0
+        efficiency = np.divide(energy_gains, ages, out=np.zeros_like(ages), where=ages > 0)
+        fitness += efficiency * 5.0
         
-        return max(0.0, fitness)  # Ensure non-negative
+        return np.maximum(fitness, 0.0, out=fitness)  # Ensure non-negative
     
     def _select_elite(self, brains: List[CellBrain]) -> List[CellBrain]:
         """Select the elite brains based on fitness"""
@@ -88,75 +90,64 @@ class EvolutionEngine:
     
     def _generate_offspring(self, elite_brains: List[CellBrain], target_population: int) -> List[CellBrain]:
         """Generate offspring from elite brains to reach target population"""
-        offspring = []
+        if not elite_brains:
+            return [CellBrain() for _ in range(target_population)]
         
         # Keep all elite brains (survivors)
-        for brain in elite_brains:
-            offspring.append(CellBrain(brain.network.copy()))
-        
-        # Generate additional offspring
-        while len(offspring) < target_population:
-            if random.random() < self.crossover_rate and len(elite_brains) >= 2:
+        offspring = [CellBrain(brain.network.copy()) for brain in elite_brains]
+        needed = target_population - len(offspring)
+        if needed <= 0:
+            return offspring[:target_population]
+        
+        # Draw every reproduction decision and parent pick for the generation up front
+        elite_count = len(elite_brains)
+        if elite_count >= 2:
+            crossover = _rng.random(needed) < self.crossover_rate
+            
+            # Two distinct parents for crossover: skip over the first when drawing the second
+            firsts = _rng.integers(0, elite_count, needed)
+            mates = _rng.integers(0, elite_count - 1, needed)
+            mates += mates >= firsts
+        else:
+            crossover = firsts = mates = np.zeros(needed, dtype=np.int64)
+        
+        # Fitness-weighted parent for asexual reproduction
+        cum_weights = np.cumsum([brain.fitness + 0.1 for brain in elite_brains])  # Add small base weight
+        parents = np.searchsorted(cum_weights, _rng.random(needed) * cum_weights[-1])
+        np.minimum(parents, elite_count - 1, out=parents)
+        
+        for is_crossover, parent, first, mate in zip(crossover.tolist(), parents.tolist(),
+                                                     firsts.tolist(), mates.tolist()):
+            if is_crossover:
                 # Sexual reproduction (crossover)
-                parent1, parent2 = random.sample(elite_brains, 2)
-                child = parent1.reproduce(parent2)
+                child = elite_brains[first].reproduce(elite_brains[mate])
             else:
                 # Asexual reproduction (mutation only)
-                parent = self._select_parent_weighted(elite_brains)
-                child = parent.reproduce()
+                child = elite_brains[parent].reproduce()
             
             offspring.append(child)
         
-        return offspring[:target_population]
+        return offspring
     
-    def _select_parent_weighted(self, elite_brains: List[CellBrain]) -> CellBrain:
-        """Select parent using fitness-weighted probability"""
-        if not elite_brains:
-            return CellBrain()
-        
-        # Create weighted selection based on fitness
-        weights = [brain.fitness + 0.1 for brain in elite_brains]  # Add small base weight
-        total_weight = sum(weights)
-        
-        if total_weight == 0:
-            return random.choice(elite_brains)
-        
-        # Weighted random selection
-        rand_weight = random.uniform(0, total_weight)
-        current_weight = 0
-        
-        for i, weight in enumerate(weights):
-            current_weight += weight
-            if current_weight >= rand_weight:
-                return elite_brains[i]
-        
-        return elite_brains[-1]  # Fallback
-    
-    def _record_generation_stats(self, brains: List[CellBrain]):
-        """Record statistics for this generation"""
-        if not brains:
-            return
-        
-        fitnesses = [brain.fitness for brain in brains]
-        ages = [brain.age_at_death for brain in brains]
-        energy_gains = [brain.energy_gained for brain in brains]
-        offspring_counts = [brain.offspring_count for brain in brains]
+    def _record_generation_stats(self, traits: np.ndarray, fitness: np.ndarray):
+        """Record statistics for this generation from its traits and fitness arrays"""
+        ages, energy_gains, offspring_counts = traits.T
         
         generation_stats = {
             'generation': self.generation,
-            'population': len(brains),
-            'fitness_avg': statistics.mean(fitnesses),
-            'fitness_max': max(fitnesses),
-            'fitness_min': min(fitnesses),
-            'age_avg': statistics.mean(ages) if ages else 0,
-            'age_max': max(ages) if ages else 0,
-            'energy_avg': statistics.mean(energy_gains) if energy_gains else 0,
-            'offspring_avg': statistics.mean(offspring_counts) if offspring_counts else 0,
-            'offspring_total': sum(offspring_counts)
+            'population': len(fitness),
+            'fitness_avg': float(fitness.mean()),
+            'fitness_max': float(fitness.max()),
+            'fitness_min': float(fitness.min()),
+            'age_avg': float(ages.mean()),
+            'age_max': int(ages.max()),
+            'energy_avg': float(energy_gains.mean()),
+            'offspring_avg': float(offspring_counts.mean()),
+            'offspring_total': int(offspring_counts.sum())
         }
         
         self.fitness_history.append(generation_stats)
-        self.population_history.append(len(brains))
+        self.population_history.append(len(fitness))
     
     def get_evolution_report(self) -> str:
         """Generate a report of evolutionary progress"""
@@ -165,7 +156,7 @@ class EvolutionEngine:
         
         latest = self.fitness_history[-1]
         
-        report = f"""
+        parts = [f"""
 === REPORTE EVOLUTIVO - GENERACIÓN {self.generation} ===
 Población: {latest['population']} cerebros
 Fitness Promedio: {latest['fitness_avg']:.3f}
@@ -174,7 +165,7 @@ Edad Promedio: {latest['age_avg']:.1f} ticks
 Edad Máxima: {latest['age_max']} ticks
 Energía Promedio Ganada: {latest['energy_avg']:.1f}
 Descendencia Total: {latest['offspring_total']}
-        """
+        """]
         
         # Evolutionary trends
         if len(self.fitness_history) >= 2:
@@ -182,18 +173,18 @@ Descendencia Total: {latest['offspring_total']}
             fitness_change = latest['fitness_avg'] - prev['fitness_avg']
             age_change = latest['age_avg'] - prev['age_avg']
             
-            report += f"\n--- TENDENCIAS ---\n"
-            report += f"Cambio en Fitness: {fitness_change:+.3f}\n"
-            report += f"Cambio en Longevidad: {age_change:+.1f} ticks\n"
+            parts.append("\n--- TENDENCIAS ---\n"
+                         f"Cambio en Fitness: {fitness_change:+.3f}\n"
+                         f"Cambio en Longevidad: {age_change:+.1f} ticks\n")
             
             if fitness_change > 0:
-                report += "📈 La población está evolucionando positivamente\n"
+                parts.append("📈 La población está evolucionando positivamente\n")
             elif fitness_change < -0.01:
-                report += "📉 La población está bajo presión evolutiva\n"
+                parts.append("📉 La población está bajo presión evolutiva\n")
             else:
-                report += "➡️  La población está en equilibrio evolutivo\n"
+                parts.append("➡️  La población está en equilibrio evolutivo\n")
         
-        return report
+        return "".join(parts)
     
     def create_champion_brain(self) -> CellBrain:
         """Create a brain based on the best performers from history"""
@@ -204,7 +195,7 @@ Descendencia Total: {latest['offspring_total']}
         champion_network = NeuralNetwork()
         
         # Apply slight positive bias to weights (evolved organisms tend to be more active)
-        for i in range(len(champion_network.weights)):
-            champion_network.weights[i] += random.uniform(-0.1, 0.2)
+        weights = champion_network.weights
+        weights += _rng.uniform(-0.1, 0.2, weights.shape).astype(weights.dtype, copy=False)
         
         return CellBrain(champion_network)
\ No newline at end of file
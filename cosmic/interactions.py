@@ -1,10 +1,15 @@
-from typing import Dict, List, Set, Optional, Any, Callable, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Set, FrozenSet, Optional, Any, Callable, Tuple, Sequence
+from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
 import random
 import math
+import sys
+from operator import itemgetter
+import copy
+import heapq
 from .objects import UniverseObject, CombinationResult
-from .properties import PropertyValue, PropertyType, PROPERTY_REGISTRY
+from .properties import PropertyValue, PropertyType, PROPERTY_REGISTRY, property_mask
 
 class InteractionType(Enum):
     """Types of interactions between objects"""
@@ -16,8 +21,30 @@ class InteractionType(Enum):
     COOL = "cool"            # Remove heat
     PRESSURE = "pressure"    # Apply pressure/force
     TOUCH = "touch"          # Gentle contact
+    
+    # Members are singletons, so identity hashing is equivalent to Enum's name hash and
+    # keeps the per-interaction rule table lookups keyed by InteractionType in C
+    __hash__ = object.__hash__
+
+# Dedicated generator for interaction rolls; reseed _rng for reproducible runs
+_rng = random.Random()
+_rand = _rng.random
+_choice = _rng.choice
+_intern = sys.intern
+
+# Interaction type by its value (or by itself), so interact() skips lower() and the Enum call
+_ACTION_LOOKUP: Dict[Any, InteractionType] = {t.value: t for t in InteractionType}
+_ACTION_LOOKUP.update({t: t for t in InteractionType})
+_ACTION_VALUE = {t: _intern(t.value) for t in InteractionType}  # Skips Enum's value descriptor in logs and keys
+
+def _interaction_type(action) -> InteractionType:
+    """Resolve an action name (any case) or InteractionType"""
+    interaction_type = _ACTION_LOOKUP.get(action)
+    if interaction_type is None:
+        interaction_type = InteractionType(action.lower())
+    return interaction_type
 
-@dataclass
+@dataclass(slots=True)
 class InteractionRule:
     """Defines what happens when specific properties interact"""
     trigger_properties: List[str]  # Properties that must be present
@@ -27,13 +54,92 @@ class InteractionRule:
     probability: float = 1.0       # Chance this rule triggers (0.0-1.0)
     requires_tool: bool = False    # Does this need a tool/intermediary?
     description: str = ""
+    
+    # Property sets and bitmasks for matching, derived from the lists above
+    trigger_set: FrozenSet[str] = field(init=False, repr=False)
+    target_set: FrozenSet[str] = field(init=False, repr=False)
+    trigger_mask: int = field(init=False, repr=False)
+    target_mask: int = field(init=False, repr=False)
+    specificity: int = field(init=False, repr=False)  # Required property count, the rule's score bonus
+    
+    def __post_init__(self):
+        self.trigger_set = frozenset(self.trigger_properties)
+        self.target_set = frozenset(self.target_properties)
+        self.trigger_mask = property_mask(self.trigger_set)
+        self.target_mask = property_mask(self.target_set)
+        self.specificity = len(self.trigger_properties) + len(self.target_properties)
+
+# Products a rule can yield, as (name, properties); each firing picks one at random
+_FERMENTATION_PRODUCTS = (
+    ("Alcohol", ("es_organico", "es_inflamable", "es_toxico")),
+    ("Vinagre", ("es_organico", "es_acido", "es_solvente")),
+    ("Gas Metano", ("es_inflamable", "es_explosivo", "vibra")),
+    ("Enzima", ("es_organico", "es_catalizador", "es_fragil")),
+)
+_ORGANIC_REFINED_PRODUCTS = (
+    ("Proteina Pura", ("es_organico", "es_nutritivo", "esta_purificado")),
+    ("Aceite Refinado", ("es_organico", "es_inflamable", "es_viscoso")),
+    ("Fibra Procesada", ("es_organico", "es_flexible", "es_duro")),
+)
+_INORGANIC_REFINED_PRODUCTS = (
+    ("Metal Puro", ("es_duro", "conduce_electricidad", "esta_purificado")),
+    ("Cristal Perfecto", ("es_cristalino", "brilla", "es_duro")),
+    ("Ceramica", ("es_duro", "es_incombustible", "es_cristalino")),
+)
+_CRYSTAL_TYPES = (
+    ("Cuarzo", ("es_cristalino", "es_piezoelectrico", "brilla")),
+    ("Sal Cristalina", ("es_cristalino", "es_solvente", "es_duro")),
+    ("Gema", ("es_cristalino", "es_duro", "absorbe_luz", "brilla")),
+)
+_FRAGMENT_TYPES = (
+    ("Fragmentos Metalicos", ("es_duro", "es_cortante", "conduce_electricidad")),
+    ("Ceniza Reactiva", ("es_organico", "es_reactivo", "es_fragil")),
+    ("Plasma", ("brilla", "es_caliente", "conduce_electricidad", "vibra")),
+)
+_ADVANCED_MATERIALS = (
+    ("Superconductor", ("es_superconductor", "es_frio", "conduce_electricidad")),
+    ("Electromagneto", ("conduce_electricidad", "es_magnetico", "genera_campo")),
+    ("Bobina de Induccion", ("conduce_electricidad", "es_magnetico", "vibra", "genera_campo")),
+)
+
+# Rare extra properties for organic mixtures and chemical compounds
+_SPECIAL_MIX_PROPERTIES = ("brilla", "es_concentrado", "conduce_electricidad")
+_SPECIAL_COMPOUND_PROPERTIES = ("es_catalizador", "es_solvente", "conduce_electricidad")
+_EVAP_STRIP = frozenset(("es_humedo", "esta_mojado"))  # Moisture left out of evaporation residues
+
+# Products with a fixed name and property list, built once and cloned by _spawn()
+_FIXED_PRODUCTS = (
+    ("Ceniza", ("es_organico", "es_fragil")),
+    ("Lanza Primitiva", ("es_organico", "es_puntiagudo", "es_liviano")),
+    ("Generador Primitivo", ("conduce_electricidad", "es_magnetico", "genera_campo")),
+    ("Bateria Cristalina", ("es_piezoelectrico", "conduce_electricidad", "es_cristalino")),
+    ("Explosion", ("es_caliente", "brilla", "vibra")),
+)
+_PRODUCT_TEMPLATES: Dict[str, UniverseObject] = {
+    name: UniverseObject(name, properties)
+    for products in (_FIXED_PRODUCTS, _FERMENTATION_PRODUCTS, _ORGANIC_REFINED_PRODUCTS,
+                     _INORGANIC_REFINED_PRODUCTS, _CRYSTAL_TYPES, _FRAGMENT_TYPES, _ADVANCED_MATERIALS)
+    for name, properties in products
+}
+
+def _spawn(name: str, x: int, y: int) -> UniverseObject:
+    """New object at (x, y) cloned from the product template with this name"""
+    product = copy.copy(_PRODUCT_TEMPLATES[name])
+    product.x, product.y = x, y
+    return product
 
 class InteractionEngine:
     """The universal motor that handles ALL object interactions"""
+    DISPATCH_CACHE_SIZE = 4096  # Distinct property patterns remembered by _find_applicable_rules
     
-    def __init__(self):
+    def __init__(self, history_size: int = 10_000, record_history: bool = True):
         self.rules = []
-        self.interaction_history = []
+        self._target_mask_by_action = {}  # InteractionType -> union of its rules' target masks
+        self._rules_by_action_trigger = {}  # (InteractionType, trigger property or None) -> rule indices
+        self._dispatch_cache = {}  # (action, actor mask, target mask, has tool) -> applicable rules
+        self.interaction_history = deque(maxlen=history_size)  # Most recent attempts only
+        self.interaction_count = 0
+        self.record_history = record_history  # False skips building interaction_history entries
         self.discovered_combinations = {}  # Track successful combinations
         self.failed_attempts = {}         # Track what doesn't work
         self._initialize_base_rules()
@@ -180,38 +286,50 @@ class InteractionEngine:
                  action_type: InteractionType, result_function: Callable,
                  probability: float = 1.0, requires_tool: bool = False, description: str = ""):
         """Add a new interaction rule to the engine"""
+        # Share the registry's interned name strings, so matching against object keys compares identity
         rule = InteractionRule(
-            trigger_properties=trigger_properties,
-            target_properties=target_properties,
+            trigger_properties=[_intern(prop) for prop in trigger_properties],
+            target_properties=[_intern(prop) for prop in target_properties],
             action_type=action_type,
             result_function=result_function,
             probability=probability,
             requires_tool=requires_tool,
             description=description
         )
+        index = len(self.rules)
         self.rules.append(rule)
+        self._dispatch_cache.clear()
+        
+        self._target_mask_by_action[action_type] = self._target_mask_by_action.get(action_type, 0) | rule.target_mask
+        for prop in rule.trigger_properties or [None]:  # Rules without triggers are keyed by None
+            self._rules_by_action_trigger.setdefault((action_type, prop), []).append(index)
     
     def interact(self, actor: UniverseObject, target: UniverseObject, 
                 action: str = "combine", tool: Optional[UniverseObject] = None) -> CombinationResult:
         """Universal interaction function - the heart of discovery"""
         
-        result = CombinationResult()
-        interaction_type = InteractionType(action.lower())
+        interaction_type = _interaction_type(action)
         
         # Log this interaction attempt
         self._log_interaction(actor, target, interaction_type, tool)
         
-        # Find applicable rules
+        # Find applicable rules and pick the best match
         applicable_rules = self._find_applicable_rules(actor, target, interaction_type, tool)
+        best_rule = self._select_best_rule(applicable_rules, actor, target) if applicable_rules else None
         
-        if not applicable_rules:
+        return self._apply_rule(actor, target, interaction_type, tool, best_rule)
+    
+    def _apply_rule(self, actor: UniverseObject, target: UniverseObject, interaction_type: InteractionType,
+                    tool: Optional[UniverseObject], best_rule: Optional[InteractionRule]) -> CombinationResult:
+        """Fire the chosen rule, or fall back to a generic interaction when no rule applies"""
+        if best_rule is None:
             # No specific rule - try generic interaction
             return self._generic_interaction(actor, target, interaction_type)
         
         # Apply the best matching rule
-        best_rule = self._select_best_rule(applicable_rules, actor, target)
+        result = CombinationResult()
         
-        if random.random() <= best_rule.probability:
+        if _rand() <= best_rule.probability:
             result = best_rule.result_function(actor, target, tool, result)
             result.success = True
             result.description = f"{best_rule.description}: {actor.name} + {target.name}"
@@ -225,28 +343,36 @@ class InteractionEngine:
         return result
     
     def _find_applicable_rules(self, actor: UniverseObject, target: UniverseObject,
-                              interaction_type: InteractionType, tool: Optional[UniverseObject]) -> List[InteractionRule]:
+                              interaction_type: InteractionType, tool: Optional[UniverseObject]) -> Tuple[InteractionRule, ...]:
         """Find all rules that could apply to this interaction"""
-        applicable_rules = []
-        
-        for rule in self.rules:
-            if rule.action_type != interaction_type:
-                continue
-            
-            # Check if actor has required trigger properties
-            actor_has_triggers = all(actor.has_property(prop) for prop in rule.trigger_properties)
-            
-            # Check if target has required target properties
-            target_has_properties = any(target.has_property(prop) for prop in rule.target_properties)
-            
-            # Check tool requirement
-            if rule.requires_tool and tool is None:
-                continue
-            
-            if actor_has_triggers and target_has_properties:
-                applicable_rules.append(rule)
-        
-        return applicable_rules
+        # No rule for this action can apply unless the target has one of their target properties
+        target_mask = target.property_mask
+        if not target_mask & self._target_mask_by_action.get(interaction_type, 0):
+            return ()
+        
+        # Applicability depends only on the property sets, so repeated patterns reuse the earlier match
+        actor_mask = actor.property_mask
+        key = (interaction_type, actor_mask, target_mask, tool is not None)
+        cached = self._dispatch_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Only rules triggered by one of the actor's properties (or by nothing) can apply
+        by_trigger = self._rules_by_action_trigger
+        candidates = set(by_trigger.get((interaction_type, None), ()))
+        for prop in actor.properties:
+            candidates.update(by_trigger.get((interaction_type, prop), ()))
+        
+        # Actor needs every trigger property, target at least one target property
+        rules = self.rules
+        applicable = tuple(rule for rule in map(rules.__getitem__, sorted(candidates))  # Keep the order rules were added in
+                           if actor_mask & rule.trigger_mask == rule.trigger_mask and target_mask & rule.target_mask
+                           and (tool is not None or not rule.requires_tool))
+        
+        if len(self._dispatch_cache) >= self.DISPATCH_CACHE_SIZE:
+            self._dispatch_cache.clear()
+        self._dispatch_cache[key] = applicable
+        return applicable
     
     def _select_best_rule(self, rules: List[InteractionRule], actor: UniverseObject, 
                          target: UniverseObject) -> InteractionRule:
@@ -254,6 +380,10 @@ class InteractionEngine:
         if len(rules) == 1:
             return rules[0]
         
+        # Property intensities, looked up once for all rules
+        actor_intensity = {name: prop.intensity for name, prop in actor.properties.items()}
+        target_intensity = {name: prop.intensity for name, prop in target.properties.items()}
+        
         # Score rules based on property matching and specificity
         scored_rules = []
         
@@ -262,21 +392,20 @@ class InteractionEngine:
             
             # Score for exact property matches
             for prop in rule.trigger_properties:
-                if actor.has_property(prop):
-                    score += actor.get_property(prop).intensity * 10
+                if prop in actor_intensity:
+                    score += actor_intensity[prop] * 10
             
             for prop in rule.target_properties:
-                if target.has_property(prop):
-                    score += target.get_property(prop).intensity * 5
+                if prop in target_intensity:
+                    score += target_intensity[prop] * 5
             
             # Bonus for more specific rules (more required properties)
-            score += len(rule.trigger_properties) + len(rule.target_properties)
+            score += rule.specificity
             
             scored_rules.append((score, rule))
         
-        # Return the highest scoring rule
-        scored_rules.sort(key=lambda x: x[0], reverse=True)
-        return scored_rules[0][1]
+        # Return the highest scoring rule (the first one on ties)
+        return max(scored_rules, key=itemgetter(0))[1]
     
     def _generic_interaction(self, actor: UniverseObject, target: UniverseObject,
                            interaction_type: InteractionType) -> CombinationResult:
@@ -305,7 +434,7 @@ class InteractionEngine:
         
         elif interaction_type == InteractionType.COMBINE:
             # Simple combination - objects just touch and maybe exchange properties
-            if random.random() < 0.1:  # 10% chance of something happening
+            if _rand() < 0.1:  # 10% chance of something happening
                 self._random_property_exchange(actor, target, result)
         
         return result
@@ -318,8 +447,8 @@ class InteractionEngine:
         transferable_props = [name for name, prop in actor.properties.items() 
                              if not prop.is_permanent and prop.intensity > 0.3]
         
-        if transferable_props and random.random() < 0.5:
-            prop_name = random.choice(transferable_props)
+        if transferable_props and _rand() < 0.5:
+            prop_name = _choice(transferable_props)
             actor_prop = actor.get_property(prop_name)
             
             # Transfer some intensity
@@ -342,21 +471,18 @@ class InteractionEngine:
         target_resistance = target.get_property("es_fragil").intensity
         
         if sharpness > target_resistance:
-            # Successful cutting - modify target
-            target.add_property("esta_roto")
-            
             # If cutting organic material, might create useful pieces
-            if target.has_property("es_organico"):
-                if random.random() < 0.6:  # 60% chance
+            if "es_organico" in target.properties:
+                if _rand() < 0.6:  # 60% chance
                     # Create a sharpened version
                     new_object = UniverseObject(f"{target.name} Puntiagudo", 
                                                ["es_organico", "es_puntiagudo", "es_fragil"])
                     new_object.x, new_object.y = target.x, target.y
                     result.add_new_object(new_object)
             
+            # Successful cutting - modify target
             damage = int(sharpness * 20)
-            target.take_damage(damage)
-            result.add_modified_object(target)
+            result.add_modified_object(target.apply_effects(damage=damage, add_props=("esta_roto",)))
         
         return result
     
@@ -368,13 +494,11 @@ class InteractionEngine:
         fragility = target.get_property("es_fragil").intensity
         
         damage = int(hardness * fragility * 25)
-        destroyed = target.take_damage(damage)
-        
-        if destroyed:
+        if target.state.durability <= damage:
+            target.apply_effects(damage=damage)
             result.add_destroyed_object(target)
         else:
-            result.add_modified_object(target)
-            target.add_property("esta_roto")
+            result.add_modified_object(target.apply_effects(damage=damage, add_props=("esta_roto",)))
         
         return result
     
@@ -384,20 +508,14 @@ class InteractionEngine:
         
         heat = actor.get_property("es_caliente").intensity
         
-        # Burn the target
-        target.add_property("esta_quemado")
-        target.change_temperature(heat * 50)  # Heat transfer
-        
+        # Burn the target, transferring heat
         damage = int(heat * 30)
-        target.take_damage(damage)
-        
-        result.add_modified_object(target)
+        result.add_modified_object(target.apply_effects(damage=damage, add_props=("esta_quemado",),
+                                                        temp_delta=heat * 50))
         
         # Burning might create ash or charcoal
-        if random.random() < 0.3:
-            ash = UniverseObject("Ceniza", ["es_organico", "es_fragil"])
-            ash.x, ash.y = target.x, target.y
-            result.add_new_object(ash)
+        if _rand() < 0.3:
+            result.add_new_object(_spawn("Ceniza", target.x, target.y))
         
         return result
     
@@ -409,10 +527,9 @@ class InteractionEngine:
         target.remove_property("esta_mojado")
         
         # Might leave behind concentrated materials
-        if target.has_property("es_nutritivo") and random.random() < 0.4:
+        if "es_nutritivo" in target.properties and _rand() < 0.4:
             concentrated = UniverseObject(f"{target.name} Concentrado", 
-                                        [prop for prop in target.properties.keys() 
-                                         if prop not in ["es_humedo", "esta_mojado"]])
+                                        [prop for prop in target.properties if prop not in _EVAP_STRIP])
             concentrated.add_property("es_concentrado")  # New emergent property!
             concentrated.x, concentrated.y = target.x, target.y
             result.add_new_object(concentrated)
@@ -426,15 +543,9 @@ class InteractionEngine:
         
         acid_strength = actor.get_property("es_acido").intensity
         
-        # Acid damages over time
+        # Acid damages over time, and might weaken hard materials
         damage = int(acid_strength * 15)
-        target.take_damage(damage)
-        
-        # Might weaken hard materials
-        if target.has_property("es_duro"):
-            target.modify_property_intensity("es_duro", -0.2)
-        
-        result.add_modified_object(target)
+        result.add_modified_object(target.apply_effects(damage=damage, intensity_mods=(("es_duro", -0.2),)))
         return result
     
     def _rule_tool_creation(self, actor: UniverseObject, target: UniverseObject,
@@ -442,17 +553,15 @@ class InteractionEngine:
         """Rule for creating pointed tools through careful shaping"""
         
         # This is a more complex interaction - creating something NEW
-        if target.has_property("es_organico") and target.has_property("es_fragil"):
+        if "es_organico" in target.properties and "es_fragil" in target.properties:
             
             # Success depends on sharpness and control
             sharpness = actor.get_property("es_cortante").intensity
             
-            if sharpness > 0.6 and random.random() < 0.7:  # Need good tools and skill
+            if sharpness > 0.6 and _rand() < 0.7:  # Need good tools and skill
                 # Create a primitive spear!
-                spear = UniverseObject("Lanza Primitiva", 
-                                     ["es_organico", "es_puntiagudo", "es_liviano"])
+                spear = _spawn("Lanza Primitiva", target.x, target.y)
                 spear.state.durability = int(target.state.durability * 0.8)  # Slightly weaker
-                spear.x, spear.y = target.x, target.y
                 
                 # This is significant! A new tool concept
                 result.add_new_object(spear)
@@ -468,36 +577,28 @@ class InteractionEngine:
         """Rule for mixing organic materials - can create new substances"""
         
         # Mixing organic materials can create new compounds
-        if random.random() < 0.4:  # 40% chance of success
+        if _rand() < 0.4:  # 40% chance of success
             
             # Combine properties from both materials
             new_properties = []
             
             # Keep common beneficial properties
-            if actor.has_property("es_nutritivo") and target.has_property("es_nutritivo"):
+            if "es_nutritivo" in actor.properties and "es_nutritivo" in target.properties:
                 new_properties.append("es_nutritivo")
             
             # Dangerous combinations
-            if (actor.has_property("es_venenoso") or target.has_property("es_venenoso")):
+            if ("es_venenoso" in actor.properties or "es_venenoso" in target.properties):
                 new_properties.extend(["es_organico", "es_venenoso"])
             else:
                 new_properties.append("es_organico")
             
             # Random chance of creating something special
-            if random.random() < 0.1:  # 10% chance
-                special_properties = ["brilla", "es_concentrado", "conduce_electricidad"]
-                new_properties.append(random.choice(special_properties))
+            if _rand() < 0.1:  # 10% chance
+                new_properties.append(_choice(_SPECIAL_MIX_PROPERTIES))
             
-            # Create the mixture
+            # Create the mixture; both originals are consumed
             mixture_name = f"Mezcla de {actor.name} y {target.name}"
-            mixture = UniverseObject(mixture_name, new_properties)
-            mixture.x, mixture.y = (actor.x + target.x) // 2, (actor.y + target.y) // 2
-            
-            result.add_new_object(mixture)
-            
-            # Both originals are consumed
-            result.add_destroyed_object(actor)
-            result.add_destroyed_object(target)
+            self._spawn_midpoint(result, mixture_name, new_properties, actor, target)
         
         return result
     
@@ -509,28 +610,22 @@ class InteractionEngine:
         compound_properties = []
         
         # Combine reactive properties
-        if actor.has_property("es_acido") and target.has_property("es_alcalino"):
+        if "es_acido" in actor.properties and "es_alcalino" in target.properties:
             # Acid + Base = Salt + neutralization
             compound_properties.extend(["es_estable", "es_cristalino"])
-        elif actor.has_property("es_explosivo") or target.has_property("es_explosivo"):
+        elif "es_explosivo" in actor.properties or "es_explosivo" in target.properties:
             # Explosive reactions create energy
             compound_properties.extend(["es_reactivo", "brilla", "es_caliente"])
         else:
             # Generic reactive combination
             compound_properties.extend(["es_reactivo", "es_hibrido"])
         
-        if random.random() < 0.3:  # 30% chance of special properties
-            special = ["es_catalizador", "es_solvente", "conduce_electricidad"]
-            compound_properties.append(random.choice(special))
+        if _rand() < 0.3:  # 30% chance of special properties
+            compound_properties.append(_choice(_SPECIAL_COMPOUND_PROPERTIES))
         
         # Create new compound
         compound_name = f"Compuesto de {actor.name} y {target.name}"
-        compound = UniverseObject(compound_name, compound_properties)
-        compound.x, compound.y = (actor.x + target.x) // 2, (actor.y + target.y) // 2
-        
-        result.add_new_object(compound)
-        result.add_destroyed_object(actor)
-        result.add_destroyed_object(target)
+        self._spawn_midpoint(result, compound_name, compound_properties, actor, target)
         
         return result
     
@@ -539,18 +634,8 @@ class InteractionEngine:
         """Rule for fermentation creating new compounds"""
         
         # Fermentation creates alcohol, acids, or gases
-        fermentation_products = [
-            ("Alcohol", ["es_organico", "es_inflamable", "es_toxico"]),
-            ("Vinagre", ["es_organico", "es_acido", "es_solvente"]),
-            ("Gas Metano", ["es_inflamable", "es_explosivo", "vibra"]),
-            ("Enzima", ["es_organico", "es_catalizador", "es_fragil"])
-        ]
-        
-        product_name, properties = random.choice(fermentation_products)
-        product = UniverseObject(product_name, properties)
-        product.x, product.y = target.x, target.y
-        
-        result.add_new_object(product)
+        product_name, _ = _choice(_FERMENTATION_PRODUCTS)
+        result.add_new_object(_spawn(product_name, target.x, target.y))
         result.add_modified_object(target)  # Original material is partially consumed
         
         return result
@@ -563,11 +648,8 @@ class InteractionEngine:
         target.add_property("esta_cargado")
         target.add_property("genera_campo")
         
-        if random.random() < 0.4:  # 40% chance of creating a generator
-            generator = UniverseObject("Generador Primitivo", 
-                                     ["conduce_electricidad", "es_magnetico", "genera_campo"])
-            generator.x, generator.y = target.x, target.y
-            result.add_new_object(generator)
+        if _rand() < 0.4:  # 40% chance of creating a generator
+            result.add_new_object(_spawn("Generador Primitivo", target.x, target.y))
         
         result.add_modified_object(target)
         return result
@@ -580,11 +662,8 @@ class InteractionEngine:
         target.add_property("brilla")  # Electrical discharge creates light
         
         # Might create a battery-like object
-        if random.random() < 0.3:
-            battery = UniverseObject("Bateria Cristalina", 
-                                   ["es_piezoelectrico", "conduce_electricidad", "es_cristalino"])
-            battery.x, battery.y = target.x, target.y
-            result.add_new_object(battery)
+        if _rand() < 0.3:
+            result.add_new_object(_spawn("Bateria Cristalina", target.x, target.y))
         
         result.add_modified_object(target)
         return result
@@ -594,26 +673,13 @@ class InteractionEngine:
         """Rule for catalytic reactions"""
         
         # Catalyst accelerates reactions - creates more refined products
-        if target.has_property("es_organico"):
-            # Organic catalysis
-            refined_products = [
-                ("Proteina Pura", ["es_organico", "es_nutritivo", "esta_purificado"]),
-                ("Aceite Refinado", ["es_organico", "es_inflamable", "es_viscoso"]),
-                ("Fibra Procesada", ["es_organico", "es_flexible", "es_duro"])
-            ]
+        if "es_organico" in target.properties:
+            refined_products = _ORGANIC_REFINED_PRODUCTS
         else:
-            # Inorganic catalysis
-            refined_products = [
-                ("Metal Puro", ["es_duro", "conduce_electricidad", "esta_purificado"]),
-                ("Cristal Perfecto", ["es_cristalino", "brilla", "es_duro"]),
-                ("Ceramica", ["es_duro", "es_incombustible", "es_cristalino"])
-            ]
-        
-        product_name, properties = random.choice(refined_products)
-        product = UniverseObject(product_name, properties)
-        product.x, product.y = target.x, target.y
+            refined_products = _INORGANIC_REFINED_PRODUCTS
         
-        result.add_new_object(product)
+        product_name, _ = _choice(refined_products)
+        result.add_new_object(_spawn(product_name, target.x, target.y))
         result.add_modified_object(target)  # Catalyst is not consumed
         
         return result
@@ -622,20 +688,11 @@ class InteractionEngine:
                              tool: Optional[UniverseObject], result: CombinationResult) -> CombinationResult:
         """Rule for crystal formation and dissolution"""
         
-        if actor.has_property("es_solvente"):
+        if "es_solvente" in actor.properties:
             # Dissolving crystal
-            if random.random() < 0.6:  # 60% chance to reform as better crystal
-                crystal_types = [
-                    ("Cuarzo", ["es_cristalino", "es_piezoelectrico", "brilla"]),
-                    ("Sal Cristalina", ["es_cristalino", "es_solvente", "es_duro"]),
-                    ("Gema", ["es_cristalino", "es_duro", "absorbe_luz", "brilla"])
-                ]
-                
-                crystal_name, properties = random.choice(crystal_types)
-                crystal = UniverseObject(crystal_name, properties)
-                crystal.x, crystal.y = target.x, target.y
-                
-                result.add_new_object(crystal)
+            if _rand() < 0.6:  # 60% chance to reform as better crystal
+                crystal_name, _ = _choice(_CRYSTAL_TYPES)
+                result.add_new_object(_spawn(crystal_name, target.x, target.y))
                 result.add_destroyed_object(target)
         
         return result
@@ -645,25 +702,16 @@ class InteractionEngine:
         """Rule for explosive reactions"""
         
         # Create explosion effects
-        explosion = UniverseObject("Explosion", ["es_caliente", "brilla", "vibra"])
-        explosion.x, explosion.y = actor.x, actor.y
+        explosion = _spawn("Explosion", actor.x, actor.y)
         explosion.state.temperature = 1000.0  # Very hot
         
         result.add_new_object(explosion)
         result.add_destroyed_object(actor)
         
         # Explosion might create fragments or new materials
-        if random.random() < 0.5:
-            fragment_types = [
-                ("Fragmentos Metalicos", ["es_duro", "es_cortante", "conduce_electricidad"]),
-                ("Ceniza Reactiva", ["es_organico", "es_reactivo", "es_fragil"]),
-                ("Plasma", ["brilla", "es_caliente", "conduce_electricidad", "vibra"])
-            ]
-            
-            fragment_name, properties = random.choice(fragment_types)
-            fragment = UniverseObject(fragment_name, properties)
-            fragment.x, fragment.y = actor.x, actor.y
-            result.add_new_object(fragment)
+        if _rand() < 0.5:
+            fragment_name, _ = _choice(_FRAGMENT_TYPES)
+            result.add_new_object(_spawn(fragment_name, actor.x, actor.y))
         
         # High damage to surroundings (simplified - would affect nearby objects)
         if target:
@@ -677,19 +725,8 @@ class InteractionEngine:
         """Rule for creating advanced conductive materials"""
         
         # Combining electrical and magnetic properties creates advanced materials
-        advanced_materials = [
-            ("Superconductor", ["es_superconductor", "es_frio", "conduce_electricidad"]),
-            ("Electromagneto", ["conduce_electricidad", "es_magnetico", "genera_campo"]),
-            ("Bobina de Induccion", ["conduce_electricidad", "es_magnetico", "vibra", "genera_campo"])
-        ]
-        
-        material_name, properties = random.choice(advanced_materials)
-        material = UniverseObject(material_name, properties)
-        material.x, material.y = (actor.x + target.x) // 2, (actor.y + target.y) // 2
-        
-        result.add_new_object(material)
-        result.add_destroyed_object(actor)
-        result.add_destroyed_object(target)
+        material_name, properties = _choice(_ADVANCED_MATERIALS)
+        self._spawn_midpoint(result, material_name, properties, actor, target)
         
         # This is a major technological breakthrough
         result.significance_score += 20.0
@@ -698,43 +735,58 @@ class InteractionEngine:
     
     # ========== UTILITY METHODS ==========
     
+    def _spawn_midpoint(self, result: CombinationResult, name: str, properties: Sequence[str],
+                        actor: UniverseObject, target: UniverseObject):
+        """Replace actor and target with a product created between them
+        
+        Known products are cloned from their template; other names are built from properties.
+        """
+        x, y = (actor.x + target.x) // 2, (actor.y + target.y) // 2
+        if name in _PRODUCT_TEMPLATES:
+            product = _spawn(name, x, y)
+        else:
+            product = UniverseObject(name, properties, x, y)
+        result.add_new_object(product)
+        result.add_destroyed_object(actor)
+        result.add_destroyed_object(target)
+    
     def _log_interaction(self, actor: UniverseObject, target: UniverseObject,
                         interaction_type: InteractionType, tool: Optional[UniverseObject]):
         """Log an interaction attempt"""
+        self.interaction_count += 1
+        if not self.record_history:
+            return
+        
         log_entry = {
             'actor': actor.name,
             'target': target.name,
-            'action': interaction_type.value,
+            'action': _ACTION_VALUE[interaction_type],
             'tool': tool.name if tool else None,
-            'timestamp': len(self.interaction_history)
+            'timestamp': self.interaction_count - 1
         }
         self.interaction_history.append(log_entry)
     
     def _store_interaction_result(self, actor: UniverseObject, target: UniverseObject,
                                  interaction_type: InteractionType, result: CombinationResult):
         """Store the result of an interaction for learning"""
-        key = (actor.name, target.name, interaction_type.value)
+        key = (actor.name, target.name, _ACTION_VALUE[interaction_type])  # Names are interned too
         
         if result.success:
-            if key not in self.discovered_combinations:
-                self.discovered_combinations[key] = []
-            self.discovered_combinations[key].append(result)
+            self.discovered_combinations.setdefault(key, []).append(result)
         else:
-            if key not in self.failed_attempts:
-                self.failed_attempts[key] = 0
-            self.failed_attempts[key] += 1
+            self.failed_attempts[key] = self.failed_attempts.get(key, 0) + 1
     
     def get_interaction_statistics(self) -> Dict[str, Any]:
         """Get statistics about interactions that have occurred"""
+        # Success count per combination, taken once; only the top five are kept, in a small heap
+        counts = ((key, len(results)) for key, results in self.discovered_combinations.items())
+        top_counts = heapq.nlargest(5, counts, key=itemgetter(1))
+        
         return {
-            'total_interactions': len(self.interaction_history),
+            'total_interactions': self.interaction_count,
             'successful_combinations': len(self.discovered_combinations),
             'failed_attempts': sum(self.failed_attempts.values()),
-            'most_successful_combinations': sorted(
-                self.discovered_combinations.keys(),
-                key=lambda k: len(self.discovered_combinations[k]),
-                reverse=True
-            )[:5]
+            'most_successful_combinations': [key for key, _ in top_counts]
         }
     
     def get_discovery_report(self) -> str:
@@ -1,10 +1,27 @@
-from typing import Dict, List, Set, Optional, Any
-from dataclasses import dataclass
-import uuid
-from .properties import PropertyValue, PropertyType, PROPERTY_REGISTRY
+from typing import Dict, List, Set, FrozenSet, Optional, Any, Sequence
+from dataclasses import dataclass, replace
+import sys
+import itertools
+from collections import deque
+from .properties import PropertyValue, PropertyType, PROPERTY_REGISTRY, PROPERTY_TYPE_VALUE, property_mask
 import random
 
-@dataclass
+_ID_COUNTER = itertools.count()  # Object ids: cheaper than uuid4 strings, unique within a run
+
+def _reserve_id(used_id: int):
+    """Make later ids larger than used_id (e.g. one restored from a save)"""
+    global _ID_COUNTER
+    _ID_COUNTER = itertools.count(max(next(_ID_COUNTER), used_id + 1))
+
+# Contribution of each physical property's intensity to interaction strength
+_STRENGTH_WEIGHTS = {"es_duro": 10, "es_cortante": 15, "es_puntiagudo": 12}
+
+# Side effects of damage and temperature, shared by the single-change methods and apply_effects()
+_BREAKS_WHEN_DAMAGED = "es_fragil"   # Gains esta_roto below 30 durability
+_BURNS_WHEN_HOT = "es_organico"      # Gains esta_quemado above 100°C
+_FREEZES_WHEN_COLD = "es_humedo"     # Lost below 0°C (water freezes)
+
+@dataclass(slots=True)
 class ObjectState:
     """Represents the current state of an object"""
     durability: int = 100  # 0 = destroyed
@@ -15,16 +32,23 @@ class ObjectState:
 
 class UniverseObject:
     """Base class for all objects in the universe that can have properties and interact"""
+    __slots__ = ("id", "name", "x", "y", "properties", "state", "history", "age",
+                 "_signature_cache", "_mask_cache", "_names_cache", "_strength_cache", "_by_type_cache")
     
-    def __init__(self, name: str, base_properties: List[str] = None, x: int = 0, y: int = 0):
-        self.id = str(uuid.uuid4())
-        self.name = name
+    def __init__(self, name: str, base_properties: Sequence[str] = None, x: int = 0, y: int = 0):
+        self.id = next(_ID_COUNTER)
+        self.name = sys.intern(name)  # Names repeat across many objects and key the discovery tables
         self.x = x
         self.y = y
         self.properties = {}  # Dict of property_name -> PropertyValue
         self.state = ObjectState()
-        self.history = []  # History of interactions and changes
+        self.history = deque(maxlen=50)  # Last changes as (tick, description, durability, temperature)
         self.age = 0
+        self._signature_cache = None  # Derived from the property set, cleared by _properties_changed()
+        self._mask_cache = None
+        self._names_cache = None
+        self._strength_cache = None  # Strength before durability, see get_interaction_strength()
+        self._by_type_cache = None  # PropertyType -> this object's properties of that type
         
         # Initialize with base properties
         if base_properties:
@@ -35,7 +59,8 @@ class UniverseObject:
         """Add a property to this object"""
         prop_instance = PROPERTY_REGISTRY.create_property_instance(property_name, intensity)
         if prop_instance:
-            self.properties[property_name] = prop_instance
+            self.properties[prop_instance.name] = prop_instance
+            self._properties_changed()
             self._log_change(f"Gained property: {prop_instance}")
             return True
         return False
@@ -46,12 +71,62 @@ class UniverseObject:
             prop = self.properties[property_name]
             if not prop.is_permanent:
                 del self.properties[property_name]
+                self._properties_changed()
                 self._log_change(f"Lost property: {prop.name}")
                 return True
             else:
                 self._log_change(f"Cannot remove permanent property: {prop.name}")
         return False
     
+    def _properties_changed(self):
+        """Drop values cached from the property set"""
+        self._signature_cache = None
+        self._mask_cache = None
+        self._names_cache = None
+        self._strength_cache = None
+        self._by_type_cache = None
+    
+    @property
+    def property_mask(self) -> int:
+        """Bitmask of this object's property names (see properties.PROPERTY_BIT)"""
+        if self._mask_cache is None:
+            self._mask_cache = property_mask(self.properties)
+        return self._mask_cache
+    
+    @property
+    def prop_names(self) -> FrozenSet[str]:
+        """Frozen set of this object's property names, usable as a cache key"""
+        if self._names_cache is None:
+            self._names_cache = frozenset(self.properties)
+        return self._names_cache
+    
+    @property
+    def signature(self) -> str:
+        """Name plus sorted property names, identifying this kind of object"""
+        if self._signature_cache is None:
+            self._signature_cache = f"{self.name}::{':'.join(sorted(self.properties))}"
+        return self._signature_cache
+    
+    def __copy__(self) -> 'UniverseObject':
+        """Independent copy with a fresh id; properties, state and history are not shared"""
+        clone = object.__new__(type(self))
+        clone.id = next(_ID_COUNTER)
+        clone.name = self.name
+        clone.x = self.x
+        clone.y = self.y
+        clone.properties = {name: PropertyValue(prop.name, prop.property_type, prop.intensity,
+                                                prop.is_permanent, prop.description)
+                            for name, prop in self.properties.items()}
+        clone.state = replace(self.state)
+        clone.history = self.history.copy()  # Entries are never mutated, so they can be shared
+        clone.age = self.age
+        clone._signature_cache = self._signature_cache
+        clone._mask_cache = self._mask_cache
+        clone._names_cache = self._names_cache
+        clone._strength_cache = self._strength_cache
+        clone._by_type_cache = None  # Would hold the original's PropertyValues
+        return clone
+    
     def has_property(self, property_name: str) -> bool:
         """Check if object has a specific property"""
         return property_name in self.properties
@@ -62,7 +137,12 @@ class UniverseObject:
     
     def get_properties_by_type(self, prop_type: PropertyType) -> List[PropertyValue]:
         """Get all properties of a specific type"""
-        return [prop for prop in self.properties.values() if prop.property_type == prop_type]
+        if self._by_type_cache is None:
+            by_type = {t: [] for t in PropertyType}
+            for prop in self.properties.values():
+                by_type[prop.property_type].append(prop)
+            self._by_type_cache = by_type
+        return list(self._by_type_cache[prop_type])
     
     def modify_property_intensity(self, property_name: str, delta: float) -> bool:
         """Modify the intensity of a property"""
@@ -70,6 +150,8 @@ class UniverseObject:
             prop = self.properties[property_name]
             old_intensity = prop.intensity
             prop.intensity = max(0.0, min(1.0, prop.intensity + delta))
+            if property_name in _STRENGTH_WEIGHTS:
+                self._strength_cache = None
             
             # Remove property if intensity reaches 0
             if prop.intensity <= 0.0 and not prop.is_permanent:
@@ -93,11 +175,76 @@ class UniverseObject:
             return True  # Object is destroyed
         
         # Lose fragile properties when badly damaged
-        if self.state.durability < 30 and self.has_property("es_fragil"):
+        if self.state.durability < 30 and _BREAKS_WHEN_DAMAGED in self.properties:
             self.add_property("esta_roto")
         
         return False
     
+    def apply_effects(self, damage: Optional[int] = None, add_props: Sequence[str] = (),
+                      remove_props: Sequence[str] = (), temp_delta: float = 0.0,
+                      intensity_mods: Sequence[tuple] = ()) -> 'UniverseObject':
+        """Apply several changes in one pass, logged as a single history entry
+        
+        Steps run in a fixed order with the same effects as the single-change methods:
+        add_props, remove_props, temp_delta, damage, then (name, delta) intensity_mods.
+        """
+        properties = self.properties
+        state = self.state
+        changes = []
+        
+        for prop_name in add_props:
+            prop = PROPERTY_REGISTRY.create_property_instance(prop_name)
+            if prop:
+                properties[prop.name] = prop
+                changes.append(f"Gained property: {prop}")
+        
+        for prop_name in remove_props:
+            prop = properties.get(prop_name)
+            if prop is None:
+                continue
+            if prop.is_permanent:
+                changes.append(f"Cannot remove permanent property: {prop.name}")
+            else:
+                del properties[prop_name]
+                changes.append(f"Lost property: {prop.name}")
+        
+        if temp_delta:
+            old_temp = state.temperature
+            state.temperature += temp_delta
+            if state.temperature > 100 and _BURNS_WHEN_HOT in properties:
+                properties["esta_quemado"] = PROPERTY_REGISTRY.create_property_instance("esta_quemado")
+            elif (state.temperature < 0 and _FREEZES_WHEN_COLD in properties
+                  and not properties[_FREEZES_WHEN_COLD].is_permanent):
+                del properties[_FREEZES_WHEN_COLD]
+            changes.append(f"Temperature change: {old_temp:.1f}°C -> {state.temperature:.1f}°C")
+        
+        if damage is not None:
+            old_durability = state.durability
+            state.durability = max(0, state.durability - damage)
+            changes.append(f"Took {damage} damage: {old_durability} -> {state.durability}")
+            if state.durability <= 0:
+                state.is_active = False
+                changes.append("Object destroyed!")
+            elif state.durability < 30 and _BREAKS_WHEN_DAMAGED in properties:
+                properties["esta_roto"] = PROPERTY_REGISTRY.create_property_instance("esta_roto")
+        
+        for prop_name, delta in intensity_mods:
+            prop = properties.get(prop_name)
+            if prop is None:
+                continue
+            old_intensity = prop.intensity
+            prop.intensity = max(0.0, min(1.0, prop.intensity + delta))
+            if prop.intensity <= 0.0 and not prop.is_permanent:
+                del properties[prop_name]
+                changes.append(f"Lost property: {prop.name}")
+            else:
+                changes.append(f"Property {prop_name} intensity: {old_intensity:.2f} -> {prop.intensity:.2f}")
+        
+        self._properties_changed()
+        if changes:
+            self._log_change("; ".join(changes))
+        return self
+    
     def heal(self, amount: int):
         """Restore durability to the object"""
         old_durability = self.state.durability
@@ -110,10 +257,10 @@ class UniverseObject:
         self.state.temperature += delta_temp
         
         # Temperature affects properties
-        if self.state.temperature > 100 and self.has_property("es_organico"):
+        if self.state.temperature > 100 and _BURNS_WHEN_HOT in self.properties:
             self.add_property("esta_quemado")
-        elif self.state.temperature < 0 and self.has_property("es_humedo"):
-            self.remove_property("es_humedo")  # Water freezes
+        elif self.state.temperature < 0 and _FREEZES_WHEN_COLD in self.properties:
+            self.remove_property(_FREEZES_WHEN_COLD)
         
         self._log_change(f"Temperature change: {old_temp:.1f}°C -> {self.state.temperature:.1f}°C")
     
@@ -125,20 +272,18 @@ class UniverseObject:
     
     def get_interaction_strength(self) -> float:
         """Calculate how strong this object is in interactions"""
-        strength = 0.0
-        
-        # Physical strength
-        if self.has_property("es_duro"):
-            strength += self.get_property("es_duro").intensity * 10
-        if self.has_property("es_cortante"):
-            strength += self.get_property("es_cortante").intensity * 15
-        if self.has_property("es_puntiagudo"):
-            strength += self.get_property("es_puntiagudo").intensity * 12
+        strength = self._strength_cache
+        if strength is None:
+            # Physical strength, kept until a property or one of these intensities changes
+            strength = 0.0
+            properties = self.properties
+            for name, weight in _STRENGTH_WEIGHTS.items():
+                if name in properties:
+                    strength += properties[name].intensity * weight
+            self._strength_cache = strength
         
         # State modifiers
-        strength *= (self.state.durability / 100.0)  # Damaged objects are weaker
-        
-        return strength
+        return strength * (self.state.durability / 100.0)  # Damaged objects are weaker
     
     def update(self):
         """Update object state each tick"""
@@ -159,23 +304,12 @@ class UniverseObject:
     
     def _log_change(self, description: str):
         """Log a change to this object's history"""
-        self.history.append({
-            'tick': self.age,
-            'description': description,
-            'state_snapshot': {
-                'durability': self.state.durability,
-                'temperature': self.state.temperature,
-                'properties': list(self.properties.keys())
-            }
-        })
-        
-        # Keep only last 50 history entries
-        if len(self.history) > 50:
-            self.history = self.history[-50:]
+        state = self.state
+        self.history.append((self.age, description, state.durability, state.temperature))
     
     def get_status_report(self) -> str:
         """Get a detailed status report of this object"""
-        report = f"=== {self.name} (ID: {self.id[:8]}) ===\n"
+        report = f"=== {self.name} (ID: {self.id:08x}) ===\n"
         report += f"Position: ({self.x}, {self.y})\n"
         report += f"Age: {self.age} ticks\n"
         report += f"Durability: {self.state.durability}/100\n"
@@ -190,8 +324,8 @@ class UniverseObject:
         
         if self.history:
             report += f"\nRecent History (last {min(5, len(self.history))} events):\n"
-            for event in self.history[-5:]:
-                report += f"  Tick {event['tick']}: {event['description']}\n"
+            for tick, description, _, _ in itertools.islice(self.history, max(0, len(self.history) - 5), None):
+                report += f"  Tick {tick}: {description}\n"
         
         return report
     
@@ -204,7 +338,7 @@ class UniverseObject:
             'y': self.y,
             'properties': {name: {
                 'name': prop.name,
-                'type': prop.property_type.value,
+                'type': PROPERTY_TYPE_VALUE[prop.property_type],
                 'intensity': prop.intensity,
                 'is_permanent': prop.is_permanent
             } for name, prop in self.properties.items()},
@@ -222,7 +356,9 @@ class UniverseObject:
     def from_dict(cls, data: Dict[str, Any]) -> 'UniverseObject':
         """Deserialize object from dictionary"""
         obj = cls(data['name'], [], data.get('x', 0), data.get('y', 0))
-        obj.id = data['id']
+        if isinstance(data.get('id'), int):  # Saves from before integer ids keep the fresh id
+            obj.id = data['id']
+            _reserve_id(obj.id)
         obj.age = data.get('age', 0)
         
         # Restore state
@@ -248,6 +384,8 @@ class UniverseObject:
 
 class CombinationResult:
     """Result of combining/interacting two objects"""
+    __slots__ = ("success", "new_objects", "modified_objects", "destroyed_objects", "description",
+                 "significance_score", "new_concepts_discovered")
     
     def __init__(self, success: bool = False):
         self.success = success
@@ -280,8 +418,7 @@ class CombinationResult:
         
         # New properties discovered
         for obj in self.modified_objects:
-            score += len([prop for prop in obj.properties.values() 
-                         if prop.property_type == PropertyType.STATE]) * 2.0
+            score += len(obj.get_properties_by_type(PropertyType.STATE)) * 2.0
         
         # Destruction is significant
         score += len(self.destroyed_objects) * 5.0
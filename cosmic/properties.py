@@ -1,7 +1,8 @@
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import random
+import sys
 
 class PropertyType(Enum):
     """Types of properties that define how they behave"""
@@ -12,7 +13,10 @@ class PropertyType(Enum):
     ENERGY = "energy"          # Energy related (conduce_electricidad, es_magnetico)
     STATE = "state"            # Temporary states (esta_mojado, esta_quemado)
 
-@dataclass
+# Interned value of each PropertyType, read directly when serializing instead of through Enum.value
+PROPERTY_TYPE_VALUE: Dict[PropertyType, str] = {t: sys.intern(t.value) for t in PropertyType}
+
+@dataclass(slots=True)
 class PropertyValue:
     """Represents a property with its intensity/value"""
     name: str
@@ -24,8 +28,20 @@ class PropertyValue:
     def __str__(self):
         return f"{self.name}({self.intensity:.2f})"
 
+@dataclass(slots=True, frozen=True)
+class InteractionOutcome:
+    """What happens when two properties interact (see Property.interact_with)"""
+    success: bool = False
+    damage: int = 0
+    new_properties: Tuple[PropertyValue, ...] = ()
+    lost_properties: Tuple[str, ...] = ()
+    description: str = ""
+
+NO_EFFECT = InteractionOutcome(description="No specific interaction")  # Shared result for property pairs that do not interact
+
 class Property:
     """Base class for all properties in the universe"""
+    __slots__ = ("name", "property_type", "intensity", "is_permanent", "description", "interactions")
     
     def __init__(self, name: str, property_type: PropertyType, intensity: float = 1.0, 
                  is_permanent: bool = True, description: str = ""):
@@ -37,10 +53,10 @@ class Property:
         self.interactions = {}  # Dict of property_name -> interaction_function
     
     def add_interaction(self, other_property: str, interaction_func: Callable):
-        """Add an interaction rule with another property"""
+        """Add an interaction rule with another property; the function returns an InteractionOutcome"""
         self.interactions[other_property] = interaction_func
     
-    def interact_with(self, other_property: 'Property', context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def interact_with(self, other_property: 'Property', context: Dict[str, Any] = None) -> InteractionOutcome:
         """Define what happens when this property interacts with another"""
         if context is None:
             context = {}
@@ -52,58 +68,50 @@ class Property:
         # Default interaction based on property types
         return self._default_interaction(other_property, context)
     
-    def _default_interaction(self, other_property: 'Property', context: Dict[str, Any]) -> Dict[str, Any]:
+    def _default_interaction(self, other_property: 'Property', context: Dict[str, Any]) -> InteractionOutcome:
         """Default interaction rules based on property types"""
-        result = {
-            'success': False,
-            'damage': 0,
-            'new_properties': [],
-            'lost_properties': [],
-            'description': f"{self.name} has no specific interaction with {other_property.name}"
-        }
-        
         # Physical interactions
         if self.property_type == PropertyType.PHYSICAL:
             if self.name == "es_duro" and other_property.name == "es_fragil":
-                result.update({
-                    'success': True,
-                    'damage': int(self.intensity * 10),
-                    'lost_properties': [other_property.name] if other_property.intensity < self.intensity else [],
-                    'description': f"Hard object damages fragile material"
-                })
+                return InteractionOutcome(
+                    success=True,
+                    damage=int(self.intensity * 10),
+                    lost_properties=(other_property.name,) if other_property.intensity < self.intensity else (),
+                    description="Hard object damages fragile material"
+                )
             elif self.name == "es_cortante" and other_property.name == "es_fragil":
-                result.update({
-                    'success': True,
-                    'new_properties': [PropertyValue("es_puntiagudo", PropertyType.PHYSICAL, 0.8, False)],
-                    'description': f"Sharp object creates pointed version of fragile material"
-                })
+                return InteractionOutcome(
+                    success=True,
+                    new_properties=(PropertyValue("es_puntiagudo", PropertyType.PHYSICAL, 0.8, False),),
+                    description="Sharp object creates pointed version of fragile material"
+                )
         
         # Thermal interactions
         elif self.property_type == PropertyType.THERMAL:
             if self.name == "es_caliente" and other_property.name == "es_organico":
-                result.update({
-                    'success': True,
-                    'damage': int(self.intensity * 20),
-                    'new_properties': [PropertyValue("esta_quemado", PropertyType.STATE, 1.0, False)],
-                    'description': f"Heat burns organic material"
-                })
+                return InteractionOutcome(
+                    success=True,
+                    damage=int(self.intensity * 20),
+                    new_properties=(PropertyValue("esta_quemado", PropertyType.STATE, 1.0, False),),
+                    description="Heat burns organic material"
+                )
             elif self.name == "es_caliente" and other_property.name == "es_humedo":
-                result.update({
-                    'success': True,
-                    'lost_properties': ["es_humedo"],
-                    'description': f"Heat evaporates moisture"
-                })
+                return InteractionOutcome(
+                    success=True,
+                    lost_properties=("es_humedo",),
+                    description="Heat evaporates moisture"
+                )
         
         # Chemical interactions
         elif self.property_type == PropertyType.CHEMICAL:
             if self.name == "es_acido" and other_property.property_type == PropertyType.PHYSICAL:
-                result.update({
-                    'success': True,
-                    'damage': int(self.intensity * 15),
-                    'description': f"Acid corrodes material"
-                })
+                return InteractionOutcome(
+                    success=True,
+                    damage=int(self.intensity * 15),
+                    description="Acid corrodes material"
+                )
         
-        return result
+        return NO_EFFECT
     
     def copy(self) -> 'Property':
         """Create a copy of this property"""
@@ -123,6 +131,7 @@ class PropertyRegistry:
     
     def __init__(self):
         self.properties = {}
+        self._templates = {}  # name -> (name, type, intensity, is_permanent, description) for new instances
         self._initialize_basic_properties()
     
     def _initialize_basic_properties(self):
@@ -194,8 +203,10 @@ class PropertyRegistry:
     def register_property(self, name: str, prop_type: PropertyType, description: str, 
                          intensity: float = 1.0, is_permanent: bool = True) -> Property:
         """Register a new property in the universe"""
+        name = sys.intern(name)  # Property instances and object keys all share this string
         prop = Property(name, prop_type, intensity, is_permanent, description)
         self.properties[name] = prop
+        self._templates[name] = (name, prop_type, intensity, is_permanent, description)
         return prop
     
     def get_property(self, name: str) -> Optional[Property]:
@@ -208,22 +219,30 @@ class PropertyRegistry:
     
     def create_property_instance(self, name: str, intensity: float = None) -> Optional[PropertyValue]:
         """Create an instance of a property with optional custom intensity"""
-        template = self.get_property(name)
-        if not template:
+        template = self._templates.get(name)
+        if template is None:
             return None
         
-        actual_intensity = intensity if intensity is not None else template.intensity
-        return PropertyValue(
-            name=template.name,
-            property_type=template.property_type,
-            intensity=actual_intensity,
-            is_permanent=template.is_permanent,
-            description=template.description
-        )
+        name, prop_type, default_intensity, is_permanent, description = template
+        return PropertyValue(name, prop_type, default_intensity if intensity is None else intensity,
+                             is_permanent, description)
     
     def list_all_properties(self) -> Dict[str, Property]:
         """Get all registered properties"""
         return self.properties.copy()
 
 # Global property registry
-PROPERTY_REGISTRY = PropertyRegistry()
\ No newline at end of file
+PROPERTY_REGISTRY = PropertyRegistry()
+
+# Bit for each property name, so whole property sets can be compared with integer ops
+PROPERTY_BIT: Dict[str, int] = {}
+
+def property_mask(names: Iterable[str]) -> int:
+    """Bitmask of a collection of property names, assigning bits to names not seen before"""
+    mask = 0
+    for name in names:
+        bit = PROPERTY_BIT.get(name)
+        if bit is None:
+            bit = PROPERTY_BIT[name] = 1 << len(PROPERTY_BIT)
+        mask |= bit
+    return mask
\ No newline at end of file
@@ -1,14 +1,24 @@
 import random
+import numpy as np
 from typing import List, Optional, Tuple
-from .cells import Celula, Planta, Herbivoro, Carnivoro
+from .cells import Celula, Planta, Herbivoro, Carnivoro, CELL_STATE
 from .evolution import EvolutionEngine
 from .brain import CellBrain
 
+_rng = np.random.default_rng()
+
 class World:
+    RANDOM_DRAWS_PER_CELL = 11  # Typical worst case of world.rand() calls by one cell in one tick
+    RANDOM_REFILL_SIZE = 256    # Floats drawn when rand() finds the pool empty
+    
     def __init__(self, width: int, height: int, evolution_enabled: bool = True):
         self.width = width
         self.height = height
         self.grid = [[None for _ in range(width)] for _ in range(height)]
+        
+        # Type codes mirroring grid (0 = empty), with a -1 wall border: cell (x, y) is at [y + 1, x + 1]
+        self.type_grid = np.full((height + 2, width + 2), -1, dtype=np.int8)
+        self.type_grid[1:-1, 1:-1] = 0
         self.tick = 0
         self.step_count = 0  # For cosmic simulation compatibility
         
@@ -20,20 +30,74 @@ class World:
         
         # Material discovery system
         self.scattered_materials = {}  # (x, y) -> UniverseObject
+        self.material_mask = np.zeros((height + 2, width + 2), dtype=bool)  # Same layout as type_grid
+        
+        # Uniform [0, 1) floats drawn in bulk each tick; rand() pops one
+        self._rand_pool = []
+    
+    def set_cell(self, x: int, y: int, cell: Optional[Celula]):
+        """Place a cell (or None) at a position, keeping type_grid in sync"""
+        self.grid[y][x] = cell
+        self.type_grid[y + 1, x + 1] = cell.TYPE_CODE if cell is not None else 0
+    
+    def scan_3x3(self, x: int, y: int, accept: np.ndarray) -> List[Tuple[int, int]]:
+        """Get the 8 adjacent positions whose type code is set in accept (see cells.type_code_mask)"""
+        matches = accept[self.type_grid[y:y + 3, x:x + 3]]
+        matches[1, 1] = False
+        
+        rows, cols = np.nonzero(matches)
+        return list(zip((cols + (x - 1)).tolist(), (rows + (y - 1)).tolist()))
+    
+    def get_neighbor_cells(self, x: int, y: int) -> List[Celula]:
+        """Get the cells occupying the 8 adjacent positions"""
+        occupied = self.type_grid[y:y + 3, x:x + 3] > 0
+        occupied[1, 1] = False
+        
+        rows, cols = np.nonzero(occupied)
+        return [self.grid[y + row - 1][x + col - 1] for row, col in zip(rows.tolist(), cols.tolist())]
+    
+    def get_material_positions(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Get positions in the 3x3 area around (x, y) that held materials at the start of this tick"""
+        rows, cols = np.nonzero(self.material_mask[y:y + 3, x:x + 3])
+        return [(x + col - 1, y + row - 1) for row, col in zip(rows.tolist(), cols.tolist())]
+    
+    def rand(self) -> float:
+        """Uniform [0, 1) float from the pool, topping it up when empty (e.g. outside a world tick)"""
+        pool = self._rand_pool
+        if not pool:
+            pool.extend(_rng.random(self.RANDOM_REFILL_SIZE).tolist())
+        return pool.pop()
+    
+    def _refill_rand_pool(self, cell_count: int):
+        """Top the random pool up to the worst-case demand of this tick in one NumPy draw"""
+        shortfall = cell_count * self.RANDOM_DRAWS_PER_CELL - len(self._rand_pool)
+        if shortfall > 0:
+            self._rand_pool.extend(_rng.random(shortfall).tolist())
+    
+    def _refresh_material_mask(self):
+        """Rebuild material_mask from scattered_materials"""
+        self.material_mask[:] = False
+        if self.scattered_materials:
+            xs, ys = zip(*self.scattered_materials.keys())
+            self.material_mask[np.array(ys) + 1, np.array(xs) + 1] = True
     
     def add_cell(self, cell: Celula) -> bool:
         """Add cell to world at its position if position is empty"""
         if (0 <= cell.x < self.width and 
             0 <= cell.y < self.height and 
             self.grid[cell.y][cell.x] is None):
-            self.grid[cell.y][cell.x] = cell
+            self.set_cell(cell.x, cell.y, cell)
             return True
         return False
     
     def remove_cell(self, x: int, y: int):
         """Remove cell at position"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x] = None
+            self.set_cell(x, y, None)
+    
+    def count_cells(self) -> int:
+        """Number of occupied positions"""
+        return int(np.count_nonzero(self.type_grid > 0))
     
     def get_cell(self, x: int, y: int) -> Optional[Celula]:
         """Get cell at position"""
@@ -59,22 +123,32 @@ class World:
         for i in range(num_plants):
             x, y = empty_positions[i]
             plant = Planta(x, y)
-            self.grid[y][x] = plant
+            self.set_cell(x, y, plant)
         
         # Add herbivores
         for i in range(num_plants, num_plants + num_herbivores):
             x, y = empty_positions[i]
             herbivore = Herbivoro(x, y)
-            self.grid[y][x] = herbivore
+            self.set_cell(x, y, herbivore)
         
         # Add carnivores
         for i in range(num_plants + num_herbivores, total_population):
             x, y = empty_positions[i]
             carnivore = Carnivoro(x, y)
-            self.grid[y][x] = carnivore
+            self.set_cell(x, y, carnivore)
     
     def update(self):
         """Update all cells in the world for one tick"""
+        cells_to_update, thinking_cells = self.begin_update()
+        
+        # Evaluate every creature's brain in one batch from the start-of-tick state
+        if thinking_cells:
+            CellBrain.plan_actions(thinking_cells, self)
+        
+        self.finish_update(cells_to_update)
+    
+    def begin_update(self) -> Tuple[List[Celula], List[Celula]]:
+        """Start a tick: age all cells and return them in acting order, plus the ones with brains"""
         self.tick += 1
         
         cells_to_update = []
@@ -84,13 +158,25 @@ class World:
                     cells_to_update.append(self.grid[y][x])
         
         random.shuffle(cells_to_update)
+        self._refresh_material_mask()
+        self._refill_rand_pool(len(cells_to_update))
         
+        # Age every cell and burn its metabolism in one vectorized step
+        slots = np.fromiter((cell._slot for cell in cells_to_update), dtype=np.intp,
+                            count=len(cells_to_update))
+        CELL_STATE.advance(slots)
+        
+        thinking_cells = [cell for cell in cells_to_update if isinstance(cell, (Herbivoro, Carnivoro))]
+        return cells_to_update, thinking_cells
+    
+    def finish_update(self, cells_to_update: List[Celula]):
+        """Finish a tick started by begin_update once brains have planned: act, then apply deaths and births"""
         new_cells = []
         cells_to_remove = []
         
         for cell in cells_to_update:
             if cell not in cells_to_remove:
-                new_cell = cell.update(self)
+                new_cell = cell.act(self)
                 
                 if cell.should_die():
                     cells_to_remove.append(cell)
@@ -106,11 +192,12 @@ class World:
                     new_cells.append(new_cell)
         
         for cell in cells_to_remove:
-            self.grid[cell.y][cell.x] = None
+            self.set_cell(cell.x, cell.y, None)
+            cell.release_state()
         
         for new_cell in new_cells:
             if self.grid[new_cell.y][new_cell.x] is None:
-                self.grid[new_cell.y][new_cell.x] = new_cell
+                self.set_cell(new_cell.x, new_cell.y, new_cell)
         
         # Check for generational evolution
         if self.evolution_enabled and self.tick % self.generation_length == 0:
@@ -175,7 +262,7 @@ class World:
             else:
                 continue
             
-            self.grid[y][x] = creature
+            self.set_cell(x, y, creature)
     
     def get_evolution_report(self) -> str:
         """Get evolution report from evolution engine"""
@@ -238,7 +325,7 @@ class World:
                 cell = self.grid[y][x]
                 if cell is None:
                     # Check if there's a scattered material here
-                    if hasattr(self, 'scattered_materials') and (x, y) in self.scattered_materials:
+                    if (x, y) in self.scattered_materials:
                         line += "◊"  # Material marker
                     else:
                         line += "."
@@ -108,14 +108,14 @@ class WebSocketManager:
                     if cell:
                         cell_type = cell.__class__.__name__
                         cell_data = {
-                            "id": id(cell),
+                            "id": cell.cid,
                             "x": x,
                             "y": y,
                             "type": cell_type,
                             "energy": getattr(cell, 'energy', None),
                             "age": getattr(cell, 'age', 0),
                             "inventory_count": len(getattr(cell, 'inventory', [])),
-                            "discoveries_count": len(getattr(cell, 'known_discoveries', set()))
+                            "discoveries_count": getattr(cell, 'known_discoveries', 0).bit_count()
                         }
                         cells_data.append(cell_data)
                         
@@ -125,14 +125,14 @@ class WebSocketManager:
                         elif cell_type == "Herbivoro":
                             cell_counts["herbivores"] += 1
                             total_inventory += len(getattr(cell, 'inventory', []))
-                            total_discoveries += len(getattr(cell, 'known_discoveries', set()))
+                            total_discoveries += getattr(cell, 'known_discoveries', 0).bit_count()
                         elif cell_type == "Carnivoro":
                             cell_counts["carnivores"] += 1
                             total_inventory += len(getattr(cell, 'inventory', []))
-                            total_discoveries += len(getattr(cell, 'known_discoveries', set()))
+                            total_discoveries += getattr(cell, 'known_discoveries', 0).bit_count()
             
             # Get scattered materials
-            scattered_materials = len(getattr(planet.world, 'scattered_materials', {}))
+            scattered_materials = len(planet.world.scattered_materials)
             
             planets_data.append({
                 "id": planet.id,
@@ -219,7 +219,7 @@ async def get_cell_details(cell_id: int):
     for planet in cosmic_sim.planets.values():
         for row in planet.world.grid:
             for cell in row:
-                if cell and id(cell) == cell_id:
+                if cell and cell.cid == cell_id:
                     # Get detailed cell info
                     inventory_details = []
                     for item in getattr(cell, 'inventory', []):
@@ -229,16 +229,14 @@ async def get_cell_details(cell_id: int):
                         })
                     
                     discoveries_details = []
-                    for discovery_id in getattr(cell, 'known_discoveries', set()):
-                        # Find discovery details
-                        for discovery in DISCOVERY_DETECTOR.discoveries:
-                            if discovery.id == discovery_id:
-                                discoveries_details.append({
-                                    "name": discovery.name,
-                                    "significance": discovery.significance,
-                                    "type": discovery.discovery_type.value
-                                })
-                                break
+                    known_discoveries = getattr(cell, 'known_discoveries', 0)  # Bitset of serials
+                    for discovery in DISCOVERY_DETECTOR.discoveries.values():
+                        if known_discoveries >> discovery.serial & 1:
+                            discoveries_details.append({
+                                "name": discovery.name,
+                                "significance": discovery.significance,
+                                "type": discovery.discovery_type.value
+                            })
                     
                     return {
                         "id": cell_id,
@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+
+from cosmic.brain import NeuralNetwork, _tanh_fast
+
+
+class NetworkForwardTest(unittest.TestCase):
+    """NeuralNetwork.forward is the public API and returns owned, activated outputs"""
+
+    def test_forward_returns_owned_array(self):
+        network = NeuralNetwork(4, 3, 2)
+        first = network.forward([1.0, 0.0, 0.0, 0.0])
+        saved = first.copy()
+        second = network.forward([0.0, 1.0, 0.0, 0.0])
+
+        self.assertIsNot(first, second)
+        np.testing.assert_array_equal(first, saved)
+
+    def test_forward_matches_logits(self):
+        network = NeuralNetwork(4, 3, 2)
+        inputs = [0.5, -0.25, 1.0, 0.0]
+        outputs = network.forward(inputs)
+        logits = network.forward_logits(inputs).copy()
+
+        np.testing.assert_array_equal(outputs, _tanh_fast(logits))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from cosmic.cosmic_world import CosmicSimulation, CosmicEvent, PlanetType
+
+
+class CosmicEventLifetimeTest(unittest.TestCase):
+    """Events survive duration_ticks calls to _process_cosmic_events and expire on the next"""
+
+    def test_event_duration(self):
+        sim = CosmicSimulation()
+        sim._rng = mock.Mock(random=mock.Mock(return_value=1.0))  # Never spawn new events
+        event = CosmicEvent("Test", "test event", [], 3, {})
+        sim.active_cosmic_events.append(event)
+
+        remaining = []
+        while sim.active_cosmic_events:
+            sim._process_cosmic_events()
+            remaining.append([e.duration_ticks for e in sim.active_cosmic_events])
+
+        self.assertEqual(remaining, [[2], [1], [0], []])
+
+
+
+class CosmicEventSpawnTest(unittest.TestCase):
+    """Spawned events depend only on the simulation's own generator"""
+
+    def _spawn_events(self, seed):
+        sim = CosmicSimulation()
+        sim._rng = np.random.default_rng(seed)
+        for i, planet_type in enumerate(PlanetType):
+            sim.create_planet(f"p{i}", f"Planet {i}", planet_type)
+        for _ in range(50):
+            sim._spawn_cosmic_event()
+        return [(event.name, event.affected_planets) for event in sim.active_cosmic_events]
+
+    def test_seeded_spawns_are_reproducible(self):
+        events = self._spawn_events(7)
+        self.assertEqual(events, self._spawn_events(7))
+        for _, affected in events:
+            self.assertEqual(len(affected), len(set(affected)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import copy
+import random
+import unittest
+
+from cosmic import interactions
+from cosmic.interactions import InteractionEngine, InteractionType
+from cosmic.objects import UniverseObject
+
+
+def _reference_applicable(engine, actor, target, interaction_type, tool):
+    """Linear scan over every rule, as rule dispatch worked before indexing and bitmasks"""
+    return [rule for rule in engine.rules
+            if rule.action_type == interaction_type
+            and all(actor.has_property(prop) for prop in rule.trigger_properties)
+            and any(target.has_property(prop) for prop in rule.target_properties)
+            and not (rule.requires_tool and tool is None)]
+
+
+def _reference_best(rules, actor, target):
+    """Highest-scoring rule, first in rule order on ties"""
+    def score(rule):
+        total = sum(actor.get_property(prop).intensity * 10
+                    for prop in rule.trigger_properties if actor.has_property(prop))
+        total += sum(target.get_property(prop).intensity * 5
+                     for prop in rule.target_properties if target.has_property(prop))
+        return total + len(rule.trigger_properties) + len(rule.target_properties)
+    return sorted(rules, key=score, reverse=True)[0]
+
+
+class RuleDispatchTest(unittest.TestCase):
+    """Indexed, bitmask and cached rule dispatch matches a linear scan over the rules"""
+
+    def setUp(self):
+        interactions._rng.seed(1234)
+        self.engine = InteractionEngine()
+
+        # Shapes the base rules lack: several triggers, no trigger, and a required tool
+        result_function = self.engine.rules[0].result_function
+        self.engine.add_rule(["es_duro", "es_cortante"], ["es_organico", "es_fragil"], InteractionType.STRIKE,
+                             result_function, requires_tool=True, description="two triggers, tool")
+        self.engine.add_rule([], ["es_humedo"], InteractionType.TOUCH, result_function, description="no trigger")
+        self.engine.add_rule(["es_caliente", "es_duro"], ["es_organico"], InteractionType.HEAT,
+                             result_function, description="two triggers")
+
+        rule_props = sorted({prop for rule in self.engine.rules
+                             for prop in rule.trigger_properties + rule.target_properties})
+        picker = random.Random(1234)
+        self.objects = [UniverseObject(f"obj{i}", picker.sample(rule_props, picker.randint(1, 4)))
+                        for i in range(40)]
+        self.objects += [UniverseObject("hacha", ["es_duro", "es_cortante"]),
+                         UniverseObject("hacha caliente", ["es_duro", "es_cortante", "es_caliente"]),
+                         UniverseObject("hoja seca", ["es_organico", "es_fragil"]),
+                         UniverseObject("musgo", ["es_organico", "es_humedo"])]
+        for obj in self.objects:
+            for name in obj.properties:
+                obj.modify_property_intensity(name, picker.uniform(-0.5, 0.5))
+        self.tool = UniverseObject("herramienta", ["es_duro"])
+
+    def _cases(self):
+        for actor in self.objects:
+            for target in self.objects:
+                if actor is not target:
+                    for interaction_type in InteractionType:
+                        for tool in (None, self.tool):
+                            yield actor, target, interaction_type, tool
+
+    def test_applicable_and_best_rules_match_linear_scan(self):
+        contested = 0
+        for _ in range(2):  # The second pass is served from the dispatch cache
+            for actor, target, interaction_type, tool in self._cases():
+                expected = _reference_applicable(self.engine, actor, target, interaction_type, tool)
+                applicable = self.engine._find_applicable_rules(actor, target, interaction_type, tool)
+                self.assertEqual(list(applicable), expected)
+                if expected:
+                    self.assertIs(self.engine._select_best_rule(applicable, actor, target),
+                                  _reference_best(expected, actor, target))
+                    contested += len(expected) > 1
+        self.assertGreater(contested, 0)
+
+    def test_seeded_interactions_are_reproducible(self):
+        def run():
+            interactions._rng.seed(99)
+            engine = InteractionEngine()
+            pairs = list(zip(self.objects, reversed(self.objects)))
+            return [engine.interact(copy.copy(actor), copy.copy(target), interaction_type).description
+                    for actor, target in pairs for interaction_type in InteractionType]
+
+        self.assertEqual(run(), run())
+
+    def test_add_rule_clears_dispatch_cache(self):
+        rule = self.engine.rules[0]
+        actor = UniverseObject("actor", rule.trigger_properties)
+        target = UniverseObject("target", rule.target_properties[:1])
+        before = self.engine._find_applicable_rules(actor, target, rule.action_type, self.tool)
+        self.assertIn(rule, before)
+        self.assertTrue(self.engine._dispatch_cache)
+
+        self.engine.add_rule(rule.trigger_properties, rule.target_properties[:1], rule.action_type,
+                             rule.result_function, description="test rule")
+        self.assertFalse(self.engine._dispatch_cache)
+
+        after = self.engine._find_applicable_rules(actor, target, rule.action_type, self.tool)
+        self.assertEqual(list(after), list(before) + [self.engine.rules[-1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from cosmic.objects import UniverseObject
+
+
+class ObjectIdTest(unittest.TestCase):
+    """Object ids stay unique across save and load"""
+
+    def test_ids_after_load_do_not_collide(self):
+        data = UniverseObject("piedra", ["es_duro"]).to_dict()
+        data['id'] += 1000  # As if saved by a run that created many more objects
+
+        restored = UniverseObject.from_dict(data)
+        created = UniverseObject("cristal", ["es_cristalino"])
+
+        self.assertEqual(restored.id, data['id'])
+        self.assertGreater(created.id, restored.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from cosmic.world import World
+from cosmic.cells import CELL_STATE, Planta, Herbivoro, Carnivoro
+
+
+class StandaloneCellUpdateTest(unittest.TestCase):
+    """Cells can be updated directly, outside World.update()"""
+
+    def test_update_outside_world_tick(self):
+        world = World(10, 10)
+        cells = [Planta(1, 1), Herbivoro(5, 5), Carnivoro(8, 8)]
+        for cell in cells:
+            self.assertTrue(world.add_cell(cell))
+
+        # No begin_update(), so the random pool starts empty
+        for _ in range(50):
+            for cell in cells:
+                cell.update(world)
+
+    def test_rand_refills_empty_pool(self):
+        world = World(4, 4)
+        values = [world.rand() for _ in range(World.RANDOM_REFILL_SIZE * 2 + 1)]
+        self.assertTrue(all(0.0 <= value < 1.0 for value in values))
+
+
+
+class DeadCellStateTest(unittest.TestCase):
+    """The world returns a dead cell's state slot as soon as it removes the cell"""
+
+    def test_dead_cell_releases_slot(self):
+        world = World(10, 10, evolution_enabled=False)
+        cell = Herbivoro(5, 5)
+        self.assertTrue(world.add_cell(cell))
+        slot = cell._slot
+        cell.energy = 0
+
+        world.update()
+
+        self.assertIsNone(world.grid[5][5])
+        self.assertIsNone(cell._slot)
+        self.assertIn(slot, CELL_STATE._free_slots)
+
+        cell.release_state()  # A second release is a no-op
+        self.assertEqual(CELL_STATE._free_slots.count(slot), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()